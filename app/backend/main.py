@@ -1,9 +1,20 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.backend.routes import api_router
+from src.tools.api import enable_cache_snapshots
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm-start the data cache from the last snapshot; it is saved again when the server exits
+    enable_cache_snapshots()
+    yield
+
 
-app = FastAPI(title="AI Hedge Fund API", description="Backend API for AI Hedge Fund", version="0.1.0")
+app = FastAPI(title="AI Hedge Fund API", description="Backend API for AI Hedge Fund", version="0.1.0", lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -63,6 +63,7 @@ async def run_hedge_fund(request: HedgeFundRequest):
                         end_date=request.end_date,
                         model_name=request.model_name,
                         model_provider=model_provider,
+                        selected_agents=request.selected_agents,
                     )
                 )
                 # Send initial message
@@ -1,12 +1,16 @@
 import asyncio
 import json
+from datetime import datetime
+
 from langchain_core.messages import HumanMessage
 from langgraph.graph import END, StateGraph
 
 from src.agents.portfolio_manager import portfolio_management_agent
 from src.agents.risk_manager import risk_management_agent
 from src.main import start
-from src.utils.analysts import ANALYST_CONFIG
+from src.tools.api import aprefetch
+from src.utils.analysts import ANALYST_CONFIG, get_data_requirements
+from src.data.requirements import plan_data_requirements
 from src.graph.state import AgentState
 
 
@@ -48,8 +52,13 @@ def create_graph(selected_agents: list[str]) -> StateGraph:
     return graph
 
 
-async def run_graph_async(graph, portfolio, tickers, start_date, end_date, model_name, model_provider):
+async def run_graph_async(graph, portfolio, tickers, start_date, end_date, model_name, model_provider, selected_agents=None):
     """Async wrapper for run_graph to work with asyncio."""
+    # Load exactly the data the selected agents read on the event loop first, so the agents in the graph run read it from the cache
+    window_days = (datetime.strptime(end_date, "%Y-%m-%d") - datetime.strptime(start_date, "%Y-%m-%d")).days
+    plan = plan_data_requirements(get_data_requirements(selected_agents), end_date, end_date, window_days)
+    await aprefetch(tickers, start_date, end_date, plan)
+
     # Use run_in_executor to run the synchronous function in a separate thread
     # so it doesn't block the event loop
     loop = asyncio.get_running_loop()
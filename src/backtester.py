@@ -11,14 +11,18 @@ import numpy as np
 import itertools
 
 from src.llm.models import LLM_ORDER, OLLAMA_LLM_ORDER, get_model_info, ModelProvider
-from src.utils.analysts import ANALYST_ORDER
+from src.utils.analysts import ANALYST_ORDER, get_data_requirements
 from src.main import run_hedge_fund
+from src.data.requirements import plan_data_requirements
 from src.tools.api import (
-    get_company_news,
-    get_price_data,
-    get_prices,
-    get_financial_metrics,
-    get_insider_trades,
+    enable_cache_snapshots,
+    get_company_news_batch,
+    get_financial_metrics_batch,
+    get_insider_trades_batch,
+    get_market_cap_batch,
+    get_price_frame,
+    get_prices_batch,
+    search_line_items_batch,
 )
 from src.utils.display import print_backtest_results, format_backtest_row
 from typing_extensions import Callable
@@ -26,6 +30,9 @@ from src.utils.ollama import ensure_ollama_and_model
 
 init(autoreset=True)
 
+# Days of history before each trading day passed to the agents as their start_date
+LOOKBACK_DAYS = 30
+
 
 class Backtester:
     def __init__(
@@ -264,26 +271,25 @@ class Backtester:
         return total_value
 
     def prefetch_data(self):
-        """Pre-fetch all data needed for the backtest period."""
+        """Pre-fetch exactly the data the selected analysts read over the backtest period."""
         print("\nPre-fetching data for the entire backtest period...")
 
-        # Convert end_date string to datetime, fetch up to 1 year before
-        end_date_dt = datetime.strptime(self.end_date, "%Y-%m-%d")
-        start_date_dt = end_date_dt - relativedelta(years=1)
-        start_date_str = start_date_dt.strftime("%Y-%m-%d")
-
-        for ticker in self.tickers:
-            # Fetch price data for the entire period, plus 1 year
-            get_prices(ticker, start_date_str, self.end_date)
-
-            # Fetch financial metrics
-            get_financial_metrics(ticker, self.end_date, limit=10)
-
-            # Fetch insider trades
-            get_insider_trades(ticker, self.end_date, start_date=self.start_date, limit=1000)
-
-            # Fetch company news
-            get_company_news(ticker, self.end_date, start_date=self.start_date, limit=1000)
+        # Union of the selected analysts' requirements (every analyst if none were selected), as of every trading day with its lookback window
+        plan = plan_data_requirements(get_data_requirements(self.selected_analysts or None), self.start_date, self.end_date, LOOKBACK_DAYS)
+
+        # Each dataset is fetched once for all tickers concurrently; failures are reported per ticker
+        batches = {
+            "prices": lambda spec: get_prices_batch(self.tickers, spec["start_date"], self.end_date),
+            "financial_metrics": lambda spec: get_financial_metrics_batch(self.tickers, self.end_date, period=spec["periods"][0], limit=spec["limit"]),
+            "line_items": lambda spec: search_line_items_batch(self.tickers, spec["fields"], self.end_date, period=spec["periods"][0], limit=spec["limit"]),
+            "market_cap": lambda spec: get_market_cap_batch(self.tickers, self.end_date),
+            "insider_trades": lambda spec: get_insider_trades_batch(self.tickers, self.end_date, start_date=spec["start_date"], limit=spec["limit"]),
+            "company_news": lambda spec: get_company_news_batch(self.tickers, self.end_date, start_date=spec["start_date"], limit=spec["limit"]),
+        }
+        for dataset, spec in plan.items():
+            _, errors = batches[dataset](spec)
+            for ticker, error in errors.items():
+                print(f"{Fore.YELLOW}Warning: failed to pre-fetch {dataset.replace('_', ' ')} for {ticker}: {error}{Style.RESET_ALL}")
 
         print("Data pre-fetch complete.")
 
@@ -304,7 +310,7 @@ class Backtester:
             self.portfolio_values = []
 
         for current_date in dates:
-            lookback_start = (current_date - timedelta(days=30)).strftime("%Y-%m-%d")
+            lookback_start = (current_date - timedelta(days=LOOKBACK_DAYS)).strftime("%Y-%m-%d")
             current_date_str = current_date.strftime("%Y-%m-%d")
             previous_date_str = (current_date - timedelta(days=1)).strftime("%Y-%m-%d")
 
@@ -319,7 +325,7 @@ class Backtester:
 
                 for ticker in self.tickers:
                     try:
-                        price_data = get_price_data(ticker, previous_date_str, current_date_str)
+                        price_data = get_price_frame(ticker, previous_date_str, current_date_str, copy=False)
                         if price_data.empty:
                             print(f"Warning: No price data for {ticker} on {current_date_str}")
                             missing_data = True
@@ -643,6 +649,7 @@ if __name__ == "__main__":
     parser.add_argument("--ollama", action="store_true", help="Use Ollama for local LLM inference")
 
     args = parser.parse_args()
+    enable_cache_snapshots()
 
     # Parse tickers from comma-separated string
     tickers = [ticker.strip() for ticker in args.tickers.split(",")] if args.tickers else []
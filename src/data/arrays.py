@@ -0,0 +1,115 @@
+import numpy as np
+
+from src.data.models import FinancialMetrics, Price
+
+# Compact per-ticker representations used inside the cache and the price store. The pydantic models are only built
+# at the API boundary, when a caller asks for them.
+
+PRICE_FIELDS = ("open", "close", "high", "low", "volume")
+PRICE_DTYPE = np.dtype(
+    [
+        ("time", "datetime64[D]"),
+        ("open", "f8"),
+        ("close", "f8"),
+        ("high", "f8"),
+        ("low", "f8"),
+        ("volume", "i8"),
+    ]
+)
+
+# Every metric is an optional float, stored as float64 with NaN for missing
+METRIC_FIELDS = tuple(field for field in FinancialMetrics.model_fields if field not in ("ticker", "report_period", "period", "currency"))
+METRICS_DTYPE = np.dtype(
+    [
+        ("report_period", "U10"),
+        ("period", "U16"),
+        ("currency", "U3"),
+    ]
+    + [(field, "f8") for field in METRIC_FIELDS]
+)
+
+
+def _get(row, field: str):
+    return row[field] if isinstance(row, dict) else getattr(row, field)
+
+
+def prices_to_array(prices: list) -> np.ndarray:
+    """Pack Price models or price dicts into a PRICE_DTYPE array."""
+    return np.array(
+        [(_get(p, "time"), _get(p, "open"), _get(p, "close"), _get(p, "high"), _get(p, "low"), _get(p, "volume")) for p in prices],
+        dtype=PRICE_DTYPE,
+    )
+
+
+def array_to_prices(data: np.ndarray) -> list[Price]:
+    """Unpack a PRICE_DTYPE array into Price models."""
+    columns = {field: data[field].tolist() for field in PRICE_FIELDS}
+    columns["time"] = np.datetime_as_string(data["time"], unit="D").tolist()
+    return [Price.model_construct(**dict(zip(columns, values))) for values in zip(*columns.values())]
+
+
+def prices_to_columns(data: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Lay out a PRICE_DTYPE array as a (field, row) float64 block in PRICE_FIELDS order plus datetime64[ns] dates,
+    which a date-indexed frame can wrap without copying."""
+    values = np.empty((len(PRICE_FIELDS), len(data)), dtype="f8")
+    for i, field in enumerate(PRICE_FIELDS):
+        values[i] = data[field]
+    return values, data["time"].astype("datetime64[ns]")
+
+
+def appends_after(existing_keys: np.ndarray, new_keys: np.ndarray) -> bool:
+    """Whether new keys are strictly increasing and all come after the last existing key, so rows can be appended as is."""
+    return (len(existing_keys) == 0 or len(new_keys) == 0 or new_keys[0] > existing_keys[-1]) and bool(np.all(new_keys[1:] > new_keys[:-1]))
+
+
+def grow(buffer: np.ndarray, size: int, extra: int) -> np.ndarray:
+    """Make room for `extra` more entries after the first `size` along the last axis of a buffer.
+
+    Returns the buffer itself when it is writable and has the spare capacity, else a copy of its first `size` entries
+    with the capacity doubled, so repeated appends cost amortized O(appended entries).
+    """
+    capacity = buffer.shape[-1]
+    if buffer.flags.writeable and size + extra <= capacity:
+        return buffer
+    grown = np.empty(buffer.shape[:-1] + (max(2 * capacity, size + extra),), dtype=buffer.dtype)
+    grown[..., :size] = buffer[..., :size]
+    return grown
+
+
+def merge_by_key(key_field: str, existing: tuple[np.ndarray, ...], new: tuple[np.ndarray, ...]) -> tuple[np.ndarray, ...]:
+    """Merge rows sorted by a unique key field, rows of `new` winning on duplicate keys.
+
+    `existing` and `new` are tuples of parallel arrays, e.g. report rows and their publication dates; the first array
+    of each holds the key field. Rows that all come after the last existing key, the usual case of new bars or a new
+    report, are appended without re-sorting the history.
+    """
+    existing_keys, new_keys = existing[0][key_field], new[0][key_field]
+    if len(new_keys) == 0:
+        return existing
+    if appends_after(existing_keys, new_keys):
+        return tuple(np.concatenate([old, added]) for old, added in zip(existing, new))
+    merged = [np.concatenate([added, old]) for old, added in zip(existing, new)]
+    # np.unique keeps the first occurrence, so new rows shadow existing ones
+    _, first = np.unique(merged[0][key_field], return_index=True)
+    return tuple(array[first] for array in merged)
+
+
+def metrics_to_array(metrics: list[FinancialMetrics]) -> np.ndarray:
+    """Pack FinancialMetrics models into a METRICS_DTYPE array."""
+    return np.array(
+        [
+            (m.report_period, m.period, m.currency, *(np.nan if (value := getattr(m, field)) is None else value for field in METRIC_FIELDS))
+            for m in metrics
+        ],
+        dtype=METRICS_DTYPE,
+    )
+
+
+def array_to_metrics(ticker: str, data: np.ndarray) -> list[FinancialMetrics]:
+    """Unpack a METRICS_DTYPE array into FinancialMetrics models, with NaN mapped back to None."""
+    results = []
+    for row in data.tolist():
+        report_period, period, currency, *values = row
+        fields = {field: None if value != value else value for field, value in zip(METRIC_FIELDS, values)}
+        results.append(FinancialMetrics.model_construct(ticker=ticker, report_period=report_period, period=period, currency=currency, **fields))
+    return results
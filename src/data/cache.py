@@ -1,69 +1,559 @@
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+from src.data.arrays import PRICE_FIELDS, appends_after, array_to_metrics, array_to_prices, grow, merge_by_key, metrics_to_array, prices_to_array, prices_to_columns
+from src.data.fundamentals import PointInTimeSeries, array_to_records, records_to_array
+from src.data.models import FinancialMetrics, Price
+
+
+def _next_day(day: str) -> str:
+    return (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+
+
+def _add_interval(intervals: list[tuple[str, str]], start: str, end: str) -> list[tuple[str, str]]:
+    """Insert an inclusive [start, end] date interval, merging overlapping and adjacent intervals."""
+    merged = []
+    for cur_start, cur_end in sorted(intervals + [(start, end)]):
+        if merged and cur_start <= _next_day(merged[-1][1]):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], cur_end))
+        else:
+            merged.append((cur_start, cur_end))
+    return merged
+
+
+def _missing_intervals(intervals: list[tuple[str, str]], start: str, end: str) -> list[tuple[str, str]]:
+    """Return the sub-intervals of the inclusive [start, end] range not covered by the given intervals."""
+    if start > end:
+        return []
+    gaps = []
+    cursor = start
+    for cur_start, cur_end in intervals:
+        if cur_end < cursor:
+            continue
+        if cur_start > end:
+            break
+        if cur_start > cursor:
+            gaps.append((cursor, (date.fromisoformat(cur_start) - timedelta(days=1)).isoformat()))
+        cursor = _next_day(cur_end)
+        if cursor > end:
+            return gaps
+    gaps.append((cursor, end))
+    return gaps
+
+
+def _price_frame(values: np.ndarray, dates: np.ndarray) -> pd.DataFrame:
+    # values is the (field, row) block from prices_to_columns; its transpose is the frame's single block as is
+    return pd.DataFrame(values.T, index=pd.DatetimeIndex(dates, name="Date", copy=False), columns=list(PRICE_FIELDS), copy=False)
+
+
+def _field_getter(*fields: str):
+    """Build a getter for one or more fields that works on both dict rows and model rows."""
+
+    def get(row):
+        values = tuple(row[field] if isinstance(row, dict) else getattr(row, field) for field in fields)
+        return values[0] if len(values) == 1 else values
+
+    return get
+
+
+class _SortedSeries:
+    """Rows for one ticker keyed by identity, with a lazily sorted view sliced by binary search.
+
+    Writes cost O(new rows): rows land in a dict keyed by their identity fields and are appended to
+    the sorted view when they arrive in date order. Out-of-order writes only mark the view dirty; it is
+    rebuilt once on the next read.
+    """
+
+    def __init__(self, key_field: str, identity_fields: tuple[str, ...] | None = None, replace: bool = True):
+        """
+        :param key_field: Date field the series is sorted and sliced by.
+        :param identity_fields: Fields that identify a row for deduplication; defaults to the date field.
+        :param replace: Whether a new row replaces an existing row with the same identity or is dropped.
+        """
+        self._get_key = _field_getter(key_field)
+        self._get_identity = _field_getter(*(identity_fields or (key_field,)))
+        self._replace = replace
+        self._by_identity: dict = {}
+        self._keys: list[str] = []
+        self._rows: list = []
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._by_identity)
+
+    def merge(self, new_rows: list):
+        """Insert new rows, deduplicating on their identity fields."""
+        for row in sorted(new_rows, key=self._get_key):
+            identity = self._get_identity(row)
+            if identity in self._by_identity:
+                if self._replace:
+                    self._replace_row(identity, row)
+                continue
+            self._by_identity[identity] = row
+            key = self._get_key(row)
+            if not self._dirty and (not self._keys or key >= self._keys[-1]):
+                self._keys.append(key)
+                self._rows.append(row)
+            else:
+                self._dirty = True
+
+    def _replace_row(self, identity, row):
+        old_row = self._by_identity[identity]
+        self._by_identity[identity] = row
+        if self._dirty:
+            return
+        key = self._get_key(old_row)
+        if self._get_key(row) == key:
+            for i in range(bisect_left(self._keys, key), bisect_right(self._keys, key)):
+                if self._rows[i] is old_row:
+                    self._rows[i] = row
+                    return
+        self._dirty = True
+
+    def _view(self) -> tuple[list[str], list]:
+        if self._dirty:
+            self._rows = sorted(self._by_identity.values(), key=self._get_key)
+            self._keys = [self._get_key(row) for row in self._rows]
+            self._dirty = False
+        return self._keys, self._rows
+
+    def slice(self, start: str | None = None, end: str | None = None) -> list:
+        """Get the rows whose date falls in the inclusive [start, end] range, oldest first."""
+        keys, rows = self._view()
+        lo = 0 if start is None else bisect_left(keys, start)
+        hi = len(keys) if end is None else bisect_right(keys, end)
+        return rows[lo:hi]
+
+    def nbytes(self) -> int:
+        """Approximate resident size, extrapolated from one sample row."""
+        size = sys.getsizeof(self._by_identity) + sys.getsizeof(self._keys) + sys.getsizeof(self._rows)
+        if not self._by_identity:
+            return size
+        sample = next(iter(self._by_identity.values()))
+        fields = sample if isinstance(sample, dict) else sample.__dict__
+        row_size = sys.getsizeof(sample) + sys.getsizeof(fields) + sum(sys.getsizeof(value) for value in fields.values())
+        return size + len(self._by_identity) * row_size
+
+
+class _ArraySeries:
+    """Rows for one ticker in a NumPy structured array sorted by a unique key field, sliced by binary search.
+
+    A row costs its fixed-width record size instead of a Python object per row and per field. The array has spare
+    capacity, so rows appended after the last key, like each day's new bars, cost amortized O(new rows).
+    """
+
+    def __init__(self, key_field: str, data: np.ndarray):
+        self._key_field = key_field
+        self._buffer = data
+        self._size = len(data)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def data(self) -> np.ndarray:
+        data = self._buffer[: self._size]
+        # Slices handed out are views, so keep callers from writing through them into the cache
+        data.flags.writeable = False
+        return data
+
+    def merge(self, new_data: np.ndarray) -> bool:
+        """Insert new rows; a new row replaces an existing row with the same key.
+
+        Returns whether the rows were appended after the existing ones, leaving those in place.
+        """
+        if appends_after(self.data[self._key_field], new_data[self._key_field]):
+            end = self._size + len(new_data)
+            self._buffer = grow(self._buffer, self._size, len(new_data))
+            self._buffer[self._size : end] = new_data
+            self._size = end
+            return True
+        (self._buffer,) = merge_by_key(self._key_field, (self.data,), (new_data,))
+        self._size = len(self._buffer)
+        return False
+
+    def _bound(self, value: str, side: str) -> int:
+        keys = self.data[self._key_field]
+        return int(np.searchsorted(keys, np.asarray(value, dtype=keys.dtype), side=side))
+
+    def slice(self, start: str | None = None, end: str | None = None) -> np.ndarray:
+        """Get the rows whose key falls in the inclusive [start, end] range, oldest first."""
+        lo = 0 if start is None else self._bound(start, "left")
+        hi = self._size if end is None else self._bound(end, "right")
+        return self.data[lo:hi]
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self) + self._buffer.nbytes
+
+
+class _PriceColumns:
+    """A ticker's prices as the column-major float64 block and dates get_price_frame wraps without copying.
+
+    Bars appended after the last date go into spare capacity, so the frame is extended in amortized O(new rows)
+    rather than rebuilt on every write.
+    """
+
+    def __init__(self, values: np.ndarray, dates: np.ndarray):
+        self._values = values
+        self._dates = dates
+        self._size = len(dates)
+        self.frame = _price_frame(values, dates)
+
+    def extend(self, data: np.ndarray):
+        """Append PRICE_DTYPE rows dated after the last one."""
+        values, dates = prices_to_columns(data)
+        end = self._size + len(dates)
+        self._values = grow(self._values, self._size, len(dates))
+        self._dates = grow(self._dates, self._size, len(dates))
+        self._values[:, self._size : end] = values
+        self._dates[self._size : end] = dates
+        self._size = end
+        self.frame = _price_frame(self._values[:, :end], self._dates[:end])
+
+    def slice(self, start: str, end: str) -> pd.DataFrame:
+        """Get the frame's rows within the inclusive [start, end] date range."""
+        # Positional, by binary search: a label lookup would first build a hash table over a just-extended index
+        dates = self._dates[: self._size]
+        lo = int(np.searchsorted(dates, np.datetime64(start, "D"), side="left"))
+        hi = int(np.searchsorted(dates, np.datetime64(end, "D"), side="right"))
+        return self.frame.iloc[lo:hi]
+
+    def nbytes(self) -> int:
+        return self._values.nbytes + self._dates.nbytes
+
+
+class _LRUDataset:
+    """Per-ticker entries of one dataset, evicted least-recently-used first once over a byte budget."""
+
+    def __init__(self, max_bytes: int | None = None):
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[str, any] = OrderedDict()
+        self.sizes: dict[str, int] = {}
+        self.updated_at: dict[str, float] = {}
+        self.resident_bytes = 0
+        self.evictions = 0
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self.entries
+
+    def get(self, ticker: str):
+        """Get an entry and mark it as most recently used."""
+        entry = self.entries.get(ticker)
+        if entry is not None:
+            self.entries.move_to_end(ticker)
+        return entry
+
+    def put(self, ticker: str, entry, nbytes: int) -> list[str]:
+        """Store an entry, then evict older entries until the budget holds. Returns the evicted tickers."""
+        self.resident_bytes += nbytes - self.sizes.get(ticker, 0)
+        self.entries[ticker] = entry
+        self.entries.move_to_end(ticker)
+        self.sizes[ticker] = nbytes
+        self.updated_at[ticker] = time.monotonic()
+
+        evicted = []
+        # The entry just written is never evicted, even if it alone exceeds the budget
+        while self.max_bytes is not None and self.resident_bytes > self.max_bytes and len(self.entries) > 1:
+            old_ticker, _ = self.entries.popitem(last=False)
+            self.resident_bytes -= self.sizes.pop(old_ticker)
+            self.updated_at.pop(old_ticker, None)
+            self.evictions += 1
+            evicted.append(old_ticker)
+        return evicted
+
+
 class Cache:
     """In-memory cache for API responses."""
 
-    def __init__(self):
-        self._prices_cache: dict[str, list[dict[str, any]]] = {}
-        self._financial_metrics_cache: dict[str, list[dict[str, any]]] = {}
-        self._line_items_cache: dict[str, list[dict[str, any]]] = {}
-        self._insider_trades_cache: dict[str, list[dict[str, any]]] = {}
-        self._company_news_cache: dict[str, list[dict[str, any]]] = {}
+    def __init__(self, max_bytes_per_dataset: int | None = None):
+        """
+        :param max_bytes_per_dataset: Approximate memory budget for each dataset; None means unbounded.
+        """
+        self._lock = threading.RLock()
+        self._prices_cache = _LRUDataset(max_bytes_per_dataset)
+        self._prices_coverage: dict[str, list[tuple[str, str]]] = {}
+        self._price_columns: dict[str, _PriceColumns] = {}
+        self._financial_metrics_cache = _LRUDataset(max_bytes_per_dataset)
+        self._line_items_cache = _LRUDataset(max_bytes_per_dataset)
+        self._insider_trades_cache = _LRUDataset(max_bytes_per_dataset)
+        self._company_news_cache = _LRUDataset(max_bytes_per_dataset)
+        self._valuation_cache = _LRUDataset(max_bytes_per_dataset)
+
+    def _datasets(self) -> dict[str, _LRUDataset]:
+        return {
+            "prices": self._prices_cache,
+            "financial_metrics": self._financial_metrics_cache,
+            "line_items": self._line_items_cache,
+            "insider_trades": self._insider_trades_cache,
+            "company_news": self._company_news_cache,
+            "valuation": self._valuation_cache,
+        }
+
+    def stats(self) -> dict[str, dict[str, int | None]]:
+        """Get per-dataset counters: cached tickers, resident bytes, budget and evictions so far."""
+        with self._lock:
+            return {
+                name: {
+                    "tickers": len(dataset.entries),
+                    "resident_bytes": dataset.resident_bytes,
+                    "max_bytes": dataset.max_bytes,
+                    "evictions": dataset.evictions,
+                }
+                for name, dataset in self._datasets().items()
+            }
+
+    def age(self, dataset: str, ticker: str) -> float | None:
+        """Get the seconds since a ticker's entry in a dataset was last written or refreshed, or None if not cached."""
+        with self._lock:
+            updated_at = self._datasets()[dataset].updated_at.get(ticker)
+            return None if updated_at is None else time.monotonic() - updated_at
+
+    def touch(self, dataset: str, ticker: str, age: float = 0.0):
+        """Mark a ticker's entry in a dataset as refreshed `age` seconds ago, e.g. just now after a refresh that found
+        nothing new, or when restoring an entry from a snapshot."""
+        with self._lock:
+            entries = self._datasets()[dataset]
+            if ticker in entries:
+                entries.updated_at[ticker] = time.monotonic() - age
+
+    def keys(self, dataset: str) -> list[str]:
+        """Get the keys cached in a dataset: tickers, or "<ticker>:<statement>" for line items."""
+        with self._lock:
+            return list(self._datasets()[dataset].entries)
+
+    def _merge(self, dataset: _LRUDataset, ticker: str, data: list, key_field: str, identity_fields: tuple[str, ...] | None = None, replace: bool = True) -> list[str]:
+        """Merge rows into a ticker's series and re-account its size. Returns the tickers evicted to make room."""
+        with self._lock:
+            series = dataset.get(ticker) or _SortedSeries(key_field, identity_fields, replace)
+            series.merge(data)
+            return dataset.put(ticker, series, series.nbytes())
+
+    def _get_all(self, dataset: _LRUDataset, ticker: str) -> list | None:
+        with self._lock:
+            series = dataset.get(ticker)
+            return series.slice() if series else None
+
+    def export_array(self, dataset: str, key: str) -> tuple[np.ndarray, np.ndarray | None] | None:
+        """Get the whole array behind an entry of prices, financial_metrics or line_items, with the publication dates
+        of the point-in-time datasets, or None if not cached."""
+        with self._lock:
+            series = self._datasets()[dataset].get(key)
+            return None if series is None else (series.data, getattr(series, "published", None))
+
+    def attach_array(self, dataset: str, key: str, data: np.ndarray, published: np.ndarray | None = None):
+        """Install an array from export_array, e.g. a read-only memory map shared between processes, as an entry without copying it."""
+        with self._lock:
+            if dataset != "prices":
+                series = PointInTimeSeries.attach("report_period", data, published)
+                self._datasets()[dataset].put(key, series, series.nbytes())
+                return
+            self._price_columns.pop(key, None)
+            series = _ArraySeries("time", data)
+            self._put_prices(key, series, series.nbytes())
 
-    def _merge_data(self, existing: list[dict] | None, new_data: list[dict], key_field: str) -> list[dict]:
-        """Merge existing and new data, avoiding duplicates based on a key field."""
-        if not existing:
-            return new_data
+    def _put_prices(self, ticker: str, series: _ArraySeries, nbytes: int):
+        """Store a ticker's price series and drop everything derived from the tickers evicted to make room."""
+        for evicted in self._prices_cache.put(ticker, series, nbytes):
+            # Coverage without the rows behind it would make get_prices skip the refetch
+            self._prices_coverage.pop(evicted, None)
+            self._price_columns.pop(evicted, None)
 
-        # Create a set of existing keys for O(1) lookup
-        existing_keys = {item[key_field] for item in existing}
+    def get_prices(self, ticker: str) -> list[Price] | None:
+        """Get all cached price data if available, sorted by date."""
+        with self._lock:
+            series = self._prices_cache.get(ticker)
+            return array_to_prices(series.slice()) if series else None
 
-        # Only add items that don't exist yet
-        merged = existing.copy()
-        merged.extend([item for item in new_data if item[key_field] not in existing_keys])
-        return merged
+    def has_prices(self, ticker: str) -> bool:
+        """Check whether any price data is cached for a ticker."""
+        with self._lock:
+            return ticker in self._prices_cache
 
-    def get_prices(self, ticker: str) -> list[dict[str, any]] | None:
-        """Get cached price data if available."""
-        return self._prices_cache.get(ticker)
+    def get_prices_in_range(self, ticker: str, start_date: str, end_date: str) -> list[Price]:
+        """Get cached prices within [start_date, end_date], sorted by date."""
+        data = self.get_price_array(ticker, start_date, end_date)
+        return array_to_prices(data) if data is not None else []
 
-    def set_prices(self, ticker: str, data: list[dict[str, any]]):
-        """Append new price data to cache."""
-        self._prices_cache[ticker] = self._merge_data(self._prices_cache.get(ticker), data, key_field="time")
+    def get_price_array(self, ticker: str, start_date: str, end_date: str) -> np.ndarray | None:
+        """Get cached prices within [start_date, end_date] as a PRICE_DTYPE array view, sorted by date."""
+        with self._lock:
+            series = self._prices_cache.get(ticker)
+            return series.slice(start_date, end_date) if series else None
 
-    def get_financial_metrics(self, ticker: str) -> list[dict[str, any]]:
-        """Get cached financial metrics if available."""
-        return self._financial_metrics_cache.get(ticker)
+    def set_prices(self, ticker: str, data: list[Price] | np.ndarray):
+        """Merge new price data, given as Price models or a PRICE_DTYPE array, into the cache."""
+        if not isinstance(data, np.ndarray):
+            data = prices_to_array(data)
+        with self._lock:
+            series = self._prices_cache.get(ticker)
+            if series is None:
+                series = _ArraySeries("time", data[:0])
+            columns = self._price_columns.get(ticker)
+            if series.merge(data) and columns is not None:
+                columns.extend(data)
+            elif columns is not None:
+                # Rows inserted or replaced before the end: rebuild the frame on next use
+                del self._price_columns[ticker]
+                columns = None
+            self._put_prices(ticker, series, series.nbytes() + (columns.nbytes() if columns is not None else 0))
 
-    def set_financial_metrics(self, ticker: str, data: list[dict[str, any]]):
-        """Append new financial metrics to cache."""
-        self._financial_metrics_cache[ticker] = self._merge_data(self._financial_metrics_cache.get(ticker), data, key_field="report_period")
+    def attach_price_frame(self, ticker: str, values: np.ndarray, dates: np.ndarray):
+        """Install the frame get_price_frame returns for a cached ticker over blocks from prices_to_columns, e.g.
+        read-only memory maps shared between processes, without copying them. The next write to the ticker copies
+        it into private memory."""
+        with self._lock:
+            if ticker in self._prices_cache:
+                self._price_columns[ticker] = _PriceColumns(values, dates)
 
-    def get_line_items(self, ticker: str) -> list[dict[str, any]] | None:
-        """Get cached line items if available."""
-        return self._line_items_cache.get(ticker)
+    def get_price_frame(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame | None:
+        """Get cached prices within [start_date, end_date] as a date-indexed float64 frame.
 
-    def set_line_items(self, ticker: str, data: list[dict[str, any]]):
-        """Append new line items to cache."""
-        self._line_items_cache[ticker] = self._merge_data(self._line_items_cache.get(ticker), data, key_field="report_period")
+        The frame for a ticker is built on first use, or attached over shared memory maps, and extended as bars are
+        appended; the result is a slice of it, so callers must copy it before modifying it.
+        """
+        with self._lock:
+            series = self._prices_cache.get(ticker)
+            if series is None:
+                return None
+            columns = self._price_columns.get(ticker)
+            if columns is None:
+                columns = self._price_columns[ticker] = _PriceColumns(*prices_to_columns(series.slice()))
+                # Count the frame against the prices budget alongside the rows it mirrors
+                self._put_prices(ticker, series, series.nbytes() + columns.nbytes())
+            return columns.slice(start_date, end_date)
+
+    def get_price_coverage(self, ticker: str) -> list[tuple[str, str]]:
+        """Get the sorted, non-overlapping date intervals for which price data has been fetched."""
+        with self._lock:
+            return self._prices_coverage.get(ticker, [])
+
+    def add_price_coverage(self, ticker: str, start_date: str, end_date: str):
+        """Mark the inclusive [start_date, end_date] range as fetched for a ticker."""
+        if start_date <= end_date:
+            with self._lock:
+                self._prices_coverage[ticker] = _add_interval(self._prices_coverage.get(ticker, []), start_date, end_date)
+
+    def missing_price_ranges(self, ticker: str, start_date: str, end_date: str) -> list[tuple[str, str]]:
+        """Get the date ranges within [start_date, end_date] that still have to be fetched."""
+        return _missing_intervals(self.get_price_coverage(ticker), start_date, end_date)
+
+    def _merge_point_in_time(self, dataset: _LRUDataset, ticker: str, data: np.ndarray, published) -> list[str]:
+        """Merge report rows and their publication dates into a ticker's point-in-time series. Returns the tickers evicted to make room."""
+        if published is None:
+            # Without publication dates a report counts as public on its report date
+            published = data["report_period"]
+        published = np.asarray(published, dtype="datetime64[D]")
+        with self._lock:
+            series = dataset.get(ticker)
+            if series is None:
+                series = PointInTimeSeries("report_period", data, published)
+            else:
+                series.merge(data, published)
+            return dataset.put(ticker, series, series.nbytes())
+
+    def has_financial_metrics(self, ticker: str) -> bool:
+        """Check whether financial metrics are cached for a ticker."""
+        with self._lock:
+            return ticker in self._financial_metrics_cache
+
+    def get_financial_metrics(self, ticker: str) -> list[FinancialMetrics] | None:
+        """Get all cached financial metrics if available, sorted by report period."""
+        with self._lock:
+            series = self._financial_metrics_cache.get(ticker)
+            return array_to_metrics(ticker, series.data) if series else None
+
+    def get_financial_metrics_as_of(self, ticker: str, end_date: str, limit: int) -> list[FinancialMetrics]:
+        """Get up to `limit` cached financial metrics published on or before end_date, newest report first."""
+        data = self.get_financial_metrics_array_as_of(ticker, end_date, limit)
+        return array_to_metrics(ticker, data) if data is not None else []
+
+    def get_financial_metrics_array_as_of(self, ticker: str, end_date: str, limit: int) -> np.ndarray | None:
+        """Get up to `limit` cached financial metrics published on or before end_date as a METRICS_DTYPE array, newest report first."""
+        with self._lock:
+            series = self._financial_metrics_cache.get(ticker)
+            return series.as_of(end_date, limit) if series else None
+
+    def set_financial_metrics(self, ticker: str, data: list[FinancialMetrics] | np.ndarray, published: list[str] | np.ndarray | None = None):
+        """Merge new financial metrics, given as models or a METRICS_DTYPE array, into the cache.
+
+        :param published: Publication date of each row; defaults to its report period.
+        """
+        if not isinstance(data, np.ndarray):
+            data = metrics_to_array(data)
+        self._merge_point_in_time(self._financial_metrics_cache, ticker, data, published)
+
+    def has_line_items(self, ticker: str, statement: str) -> bool:
+        """Check whether line items of a statement are cached for a ticker."""
+        with self._lock:
+            return f"{ticker}:{statement}" in self._line_items_cache
+
+    def get_line_items(self, ticker: str, statement: str) -> list[dict[str, any]] | None:
+        """Get cached line items of a statement if available, sorted by report period."""
+        with self._lock:
+            series = self._line_items_cache.get(f"{ticker}:{statement}")
+            return array_to_records(series.data) if series else None
+
+    def get_line_items_as_of(self, ticker: str, statement: str, end_date: str, limit: int) -> list[dict[str, any]]:
+        """Get up to `limit` cached line items of a statement published on or before end_date, newest report first."""
+        with self._lock:
+            series = self._line_items_cache.get(f"{ticker}:{statement}")
+            return array_to_records(series.as_of(end_date, limit)) if series else []
+
+    def set_line_items(self, ticker: str, statement: str, data: list[dict[str, any]], published: list[str] | np.ndarray | None = None):
+        """Merge new line items of a statement into the cache.
+
+        :param published: Publication date of each row; defaults to its report period.
+        """
+        if data:
+            self._merge_point_in_time(self._line_items_cache, f"{ticker}:{statement}", records_to_array(data, "report_period"), published)
 
     def get_insider_trades(self, ticker: str) -> list[dict[str, any]] | None:
-        """Get cached insider trades if available."""
-        return self._insider_trades_cache.get(ticker)
+        """Get cached insider trades if available, sorted by filing date."""
+        return self._get_all(self._insider_trades_cache, ticker)
 
     def set_insider_trades(self, ticker: str, data: list[dict[str, any]]):
         """Append new insider trades to cache."""
-        self._insider_trades_cache[ticker] = self._merge_data(self._insider_trades_cache.get(ticker), data, key_field="filing_date")  # Could also use transaction_date if preferred
+        # Several trades can share a filing date, so identify a trade by who traded how much
+        self._merge(self._insider_trades_cache, ticker, data, key_field="filing_date", identity_fields=("filing_date", "name", "transaction_shares", "shares_owned_after_transaction"), replace=False)
+
+    def has_company_news(self, ticker: str) -> bool:
+        """Check whether company news has been fetched for a ticker, even if there was none."""
+        with self._lock:
+            return ticker in self._company_news_cache
 
     def get_company_news(self, ticker: str) -> list[dict[str, any]] | None:
-        """Get cached company news if available."""
-        return self._company_news_cache.get(ticker)
+        """Get cached company news if available, sorted by date."""
+        return self._get_all(self._company_news_cache, ticker)
 
     def set_company_news(self, ticker: str, data: list[dict[str, any]]):
         """Append new company news to cache."""
-        self._company_news_cache[ticker] = self._merge_data(self._company_news_cache.get(ticker), data, key_field="date")
+        self._merge(self._company_news_cache, ticker, data, key_field="date", identity_fields=("date", "url"), replace=False)
+
+    def get_valuation(self, ticker: str):
+        """Get the cached daily valuation DataFrame for a ticker if available."""
+        with self._lock:
+            return self._valuation_cache.get(ticker)
+
+    def set_valuation(self, ticker: str, data):
+        """Replace the cached daily valuation DataFrame for a ticker."""
+        with self._lock:
+            self._valuation_cache.put(ticker, data, int(data.memory_usage(deep=True).sum()))
+
 
+# Settings are read at import time, which can precede the entry point's own load_dotenv()
+load_dotenv()
 
-# Global cache instance
-_cache = Cache()
+# Global cache instance, bounded by CACHE_MAX_BYTES per dataset when set
+_cache = Cache(max_bytes_per_dataset=int(os.environ["CACHE_MAX_BYTES"]) if os.getenv("CACHE_MAX_BYTES") else None)
 
 
 def get_cache() -> Cache:
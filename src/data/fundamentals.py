@@ -0,0 +1,89 @@
+import sys
+from bisect import insort
+
+import numpy as np
+import pandas as pd
+
+from src.data.arrays import merge_by_key
+
+# Point-in-time fundamentals: every report row carries the date it became public, and queries only see rows published
+# on or before the simulated date, so backtests cannot look ahead at reports that were not out yet.
+
+
+def publication_deadline(report_periods) -> np.ndarray:
+    """Latest date a report for each period may be published under CSRC disclosure rules.
+
+    Q1 reports are due by 04-30, half-year reports by 08-31, Q3 reports by 10-31 and annual reports by 04-30 of the
+    following year. Used when the actual publication date is unknown, so a report is never visible before it was out.
+    """
+    periods = pd.DatetimeIndex(pd.to_datetime(pd.Series(report_periods), errors="coerce"))
+    months_after = np.select([periods.month == 3, periods.month == 6, periods.month == 9], [1, 2, 1], default=4)
+    deadlines = [period + pd.offsets.MonthEnd(months) if not pd.isna(period) else pd.NaT for period, months in zip(periods, months_after)]
+    return pd.DatetimeIndex(deadlines).to_numpy(dtype="datetime64[D]")
+
+
+def records_to_array(records: list[dict[str, any]], key_field: str) -> np.ndarray:
+    """Pack report rows into a structured array: the key as a YYYY-MM-DD string, every other field as float64 with NaN for missing."""
+    fields = [field for field in dict.fromkeys(field for record in records for field in record) if field != key_field]
+    dtype = np.dtype([(key_field, "U10")] + [(field, "f8") for field in fields])
+    return np.array(
+        [(record[key_field], *(np.nan if record.get(field) is None else record[field] for field in fields)) for record in records],
+        dtype=dtype,
+    )
+
+
+def array_to_records(data: np.ndarray) -> list[dict[str, any]]:
+    """Unpack a structured array of report rows into dicts, with NaN mapped back to None."""
+    names = data.dtype.names
+    return [{name: None if value != value else value for name, value in zip(names, row)} for row in data.tolist()]
+
+
+class PointInTimeSeries:
+    """Report rows for one ticker, sorted by report period, with an as-of index over their publication dates.
+
+    The index keeps one snapshot per publication: the positions of every row public at that point, newest report
+    first. An as-of query is a binary search for the snapshot plus a slice, with no per-call filtering.
+    """
+
+    def __init__(self, key_field: str, data: np.ndarray, published: np.ndarray):
+        self._key_field = key_field
+        self.data = data[:0]
+        self.published = published[:0]
+        self.merge(data, published)
+
+    @classmethod
+    def attach(cls, key_field: str, data: np.ndarray, published: np.ndarray) -> "PointInTimeSeries":
+        """Wrap rows already sorted and deduplicated by report period, e.g. a read-only memory map, without copying them."""
+        series = cls.__new__(cls)
+        series._key_field = key_field
+        series.data = data
+        series.published = np.asarray(published, dtype="datetime64[D]")
+        series._build_index()
+        return series
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def merge(self, new_data: np.ndarray, new_published: np.ndarray):
+        """Insert new rows and their publication dates; a new row replaces an existing row for the same report period."""
+        self.data, self.published = merge_by_key(self._key_field, (self.data, self.published), (new_data, np.asarray(new_published, dtype="datetime64[D]")))
+        self.data.flags.writeable = False
+        self._build_index()
+
+    def _build_index(self):
+        # Rows are sorted by report period, so a row's position is also its rank
+        order = np.argsort(self.published, kind="stable")
+        self._published_sorted = self.published[order]
+        visible: list[int] = []
+        self._snapshots = [np.empty(0, dtype=np.intp)]
+        for position in order:
+            insort(visible, int(position))
+            self._snapshots.append(np.array(visible[::-1], dtype=np.intp))
+
+    def as_of(self, date: str, limit: int) -> np.ndarray:
+        """Get up to `limit` rows published on or before date, newest report period first."""
+        snapshot = int(np.searchsorted(self._published_sorted, np.datetime64(date, "D"), side="right"))
+        return self.data[self._snapshots[snapshot][:limit]]
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self) + self.data.nbytes + self.published.nbytes * 2 + sum(snapshot.nbytes for snapshot in self._snapshots)
@@ -2,6 +2,9 @@ from pydantic import BaseModel
 
 
 class Price(BaseModel):
+    # Frozen so cached instances can be shared between callers
+    model_config = {"frozen": True}
+
     open: float
     close: float
     high: float
@@ -16,6 +19,8 @@ class PriceResponse(BaseModel):
 
 
 class FinancialMetrics(BaseModel):
+    model_config = {"frozen": True}
+
     ticker: str
     report_period: str
     period: str
@@ -0,0 +1,131 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+from dotenv import load_dotenv
+
+from src.data.arrays import merge_by_key, prices_to_array
+from src.data.cache import _add_interval
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+DEFAULT_PRICE_STORE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".cache", "prices")
+
+
+@contextmanager
+def _file_lock(path: str, shared: bool = False):
+    """Hold an OS-level lock on path, exclusive unless shared, so other processes using the store wait for it."""
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            # msvcrt has no shared locks; LK_LOCK gives up after about 10 seconds, so keep trying
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class PriceStore:
+    """Persistent on-disk price store, one memory-mapped NumPy partition per ticker.
+
+    A ticker's rows and the date intervals they cover are read together and written together under a lock file, so
+    processes sharing the store (CLI, backend, pool workers) never lose each other's rows or trust coverage whose rows
+    they did not load.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _path(self, ticker: str) -> str:
+        return os.path.join(self.root, f"{ticker}.npy")
+
+    def _coverage_path(self, ticker: str) -> str:
+        return os.path.join(self.root, f"{ticker}.coverage.json")
+
+    @contextmanager
+    def _locked(self, ticker: str, shared: bool = False):
+        os.makedirs(self.root, exist_ok=True)
+        with self._lock, _file_lock(os.path.join(self.root, f"{ticker}.lock"), shared):
+            yield
+
+    def _write_atomic(self, path: str, write):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+
+    def _load(self, ticker: str, mmap_mode: str | None = "r") -> np.ndarray | None:
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return None
+        try:
+            return np.load(path, mmap_mode=mmap_mode)
+        except (OSError, ValueError):
+            # A truncated or foreign file is treated as a miss and rewritten on the next append
+            return None
+
+    def _read_coverage(self, ticker: str) -> list[tuple[str, str]]:
+        try:
+            with open(self._coverage_path(ticker), encoding="utf-8") as f:
+                return [tuple(interval) for interval in json.load(f)]
+        except (OSError, ValueError):
+            return []
+
+    def read(self, ticker: str) -> tuple[np.ndarray | None, list[tuple[str, str]]]:
+        """Read a ticker's stored price rows, as an in-memory PRICE_DTYPE array sorted by date (None if there are
+        none), and the date intervals already fetched for it."""
+        with self._locked(ticker, shared=True):
+            data = self._load(ticker)
+            if data is None or len(data) == 0:
+                return None, []
+            return np.array(data), self._read_coverage(ticker)
+
+    def append(self, ticker: str, rows: list[dict[str, any]] | np.ndarray, covered: list[tuple[str, str]] = ()):
+        """Merge new price rows, given as dicts or a PRICE_DTYPE array, into the ticker's partition, newest rows winning
+        on duplicate dates, and add the date intervals they were fetched for to its coverage."""
+        new = rows if isinstance(rows, np.ndarray) else prices_to_array(rows)
+        with self._locked(ticker):
+            if len(new):
+                # Read the partition into memory: it is replaced below, which Windows refuses while a mapping of it is open
+                existing = self._load(ticker, mmap_mode=None)
+                (merged,) = merge_by_key("time", (existing if existing is not None else new[:0],), (new,))
+                self._write_atomic(self._path(ticker), lambda f: np.save(f, merged))
+
+            # Rows first, so stored coverage never claims rows that did not make it to disk; merge with what other
+            # processes recorded since this one last read it
+            intervals = self._read_coverage(ticker)
+            for interval_start, interval_end in covered:
+                intervals = _add_interval(intervals, interval_start, interval_end)
+            payload = json.dumps([list(interval) for interval in intervals]).encode("utf-8")
+            self._write_atomic(self._coverage_path(ticker), lambda f: f.write(payload))
+
+
+load_dotenv()
+
+# Global price store instance
+_price_store = PriceStore(os.getenv("PRICE_STORE_DIR") or DEFAULT_PRICE_STORE_DIR)
+
+
+def get_price_store() -> PriceStore:
+    """Get the global price store instance."""
+    return _price_store
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+
+# Each analyst declares the data it reads per ticker, as a dict of dataset to spec:
+#   prices:            {"start": ...}
+#   financial_metrics: {"period": "ttm" | "annual", "limit": int}
+#   line_items:        {"fields": [...], "period": "ttm" | "annual", "limit": int}
+#   market_cap:        {}
+#   insider_trades:    {"start": ..., "limit": int}
+#   company_news:      {"start": ..., "limit": int}
+# "start" is where the data begins relative to the run's as-of date: WINDOW for the run's own start_date, a number of
+# days before the as-of date, or None for no lower bound (the newest `limit` rows).
+WINDOW = "window"
+
+# Prefetch order; datasets bounded by a start date are fetched as a date range
+DATASETS = ("prices", "financial_metrics", "line_items", "market_cap", "insider_trades", "company_news")
+RANGED_DATASETS = ("prices", "insider_trades", "company_news")
+
+# The risk manager is part of every run and reads prices over the run window
+BASE_REQUIREMENTS = {"prices": {"start": WINDOW}}
+
+
+def _days_before(date: str, days: int) -> str:
+    return (datetime.strptime(date, "%Y-%m-%d") - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def plan_data_requirements(requirements: list[dict], start_date: str, end_date: str, window_days: int) -> dict[str, dict]:
+    """
+    Merge the data requirements of a set of analysts into one fetch per dataset.
+
+    Runs are as of every date in [start_date, end_date], each with a window starting window_days before its as-of date.
+    Returns, per dataset in prefetch order, a spec with:
+      start_date: earliest date any run reads (None for no lower bound; ranged datasets only),
+      end_date: the last as-of date,
+      limit: the largest row count any run reads, or None when the range must be fetched whole,
+      periods: the report periods read (financial metrics and line items),
+      fields: the union of line items read.
+    """
+    plan = {}
+    for dataset_specs in [BASE_REQUIREMENTS, *requirements]:
+        for dataset, spec in dataset_specs.items():
+            if dataset not in DATASETS:
+                raise ValueError(f"Unknown dataset in data requirements: {dataset}")
+            entry = plan.setdefault(dataset, {"start_date": end_date, "end_date": end_date, "limit": 0, "periods": [], "fields": []})
+
+            if dataset in RANGED_DATASETS and entry["start_date"] is not None:
+                start = spec.get("start", WINDOW)
+                if start is None:
+                    entry["start_date"] = None
+                else:
+                    entry["start_date"] = min(entry["start_date"], _days_before(start_date, window_days if start == WINDOW else start))
+            if "limit" in spec:
+                entry["limit"] = max(entry["limit"], spec["limit"])
+            if "period" in spec and spec["period"] not in entry["periods"]:
+                entry["periods"].append(spec["period"])
+            entry["fields"].extend(field for field in spec.get("fields", []) if field not in entry["fields"])
+
+    for dataset, entry in plan.items():
+        # Runs as of different dates each want their own newest rows, so a range spanning several as-of dates is
+        # fetched whole; a single run only needs the largest limit
+        if dataset not in RANGED_DATASETS:
+            entry["start_date"] = None
+        elif start_date != end_date:
+            entry["limit"] = None
+        if entry["limit"] == 0:
+            entry["limit"] = None
+    return {dataset: plan[dataset] for dataset in DATASETS if dataset in plan}
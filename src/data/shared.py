@@ -0,0 +1,156 @@
+import json
+import os
+import shutil
+import tempfile
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+from src.data.arrays import prices_to_columns
+from src.data.cache import Cache, get_cache
+
+# Read-only data plane for process-pool workers: the parent publishes its cached price arrays, point-in-time
+# fundamentals and valuation series once as .npy files, and each worker memory-maps them into its own cache. Prices
+# are also published in the column layout of the frames get_price_frame returns, so workers wrap those maps instead
+# of building a float64 copy each. The pages are shared through the OS page cache, so memory use and upstream
+# fetches do not grow with the worker count.
+
+load_dotenv()
+
+# Where published data lives; defaults to /dev/shm (RAM-backed) when available, else the system temp dir
+SHARED_DATA_DIR = os.getenv("SHARED_DATA_DIR") or ("/dev/shm" if os.path.isdir("/dev/shm") else None)
+
+MANIFEST = "manifest.json"
+ARRAY_DATASETS = ("prices", "financial_metrics", "line_items")
+
+
+def _file_name(key: str) -> str:
+    # Line item keys are "<ticker>:<statement>"; keep file names portable
+    return f"{key.replace(':', '__')}.npy"
+
+
+def _valuation_to_array(value_df: pd.DataFrame) -> tuple[np.ndarray, list[str]]:
+    """Pack the date and numeric columns of a valuation series into a structured array, with the column names kept
+    apart since non-ASCII field names would need a newer .npy format."""
+    columns = ["数据日期", *(column for column in value_df.select_dtypes("number").columns if column != "数据日期")]
+    data = np.empty(len(value_df), dtype=[("f0", "datetime64[ns]")] + [(f"f{i}", "f8") for i in range(1, len(columns))])
+    data["f0"] = value_df["数据日期"].to_numpy(dtype="datetime64[ns]")
+    for i, column in enumerate(columns[1:], start=1):
+        data[f"f{i}"] = value_df[column].to_numpy(dtype="f8", na_value=np.nan)
+    return data, columns
+
+
+def _array_to_valuation(data: np.ndarray, columns: list[str]) -> pd.DataFrame:
+    return pd.DataFrame({column: data[name] for column, name in zip(columns, data.dtype.names)}, copy=False)
+
+
+def publish(root: str, tickers: list[str], cache: Cache | None = None) -> dict:
+    """Write the cached data of the given tickers under root and return the manifest workers attach from."""
+    cache = cache or get_cache()
+    manifest = {dataset: {} for dataset in (*ARRAY_DATASETS, "valuation")}
+    manifest["price_coverage"] = {}
+    tickers = list(dict.fromkeys(tickers))
+
+    def save(dataset: str, key: str, data: np.ndarray, suffix: str = "") -> str:
+        path = os.path.join(root, dataset, _file_name(key).replace(".npy", f"{suffix}.npy"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.save(path, data)
+        return os.path.relpath(path, root)
+
+    for ticker in tickers:
+        keys = {
+            "prices": [ticker],
+            "financial_metrics": [ticker],
+            "line_items": [key for key in cache.keys("line_items") if key.split(":", 1)[0] == ticker],
+        }
+        for dataset, dataset_keys in keys.items():
+            for key in dataset_keys:
+                if (exported := cache.export_array(dataset, key)) is None:
+                    continue
+                data, published = exported
+                entry = {"data": save(dataset, key, data)}
+                if published is not None:
+                    entry["published"] = save(dataset, key, published, ".published")
+                if dataset == "prices":
+                    values, dates = prices_to_columns(data)
+                    entry["frame"] = save(dataset, key, values, ".frame")
+                    entry["dates"] = save(dataset, key, dates, ".dates")
+                manifest[dataset][key] = entry
+        if ticker in manifest["prices"]:
+            manifest["price_coverage"][ticker] = cache.get_price_coverage(ticker)
+        if (value_df := cache.get_valuation(ticker)) is not None:
+            data, columns = _valuation_to_array(value_df)
+            manifest["valuation"][ticker] = {"data": save("valuation", ticker, data), "columns": columns}
+
+    with open(os.path.join(root, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    return manifest
+
+
+def attach(
+    root: str,
+    cache: Cache | None = None,
+    include: Callable[[str, str], bool] | None = None,
+    mmap_mode: str | None = "r",
+) -> list[tuple[str, str]]:
+    """Load the data published under root into a cache (the global one by default) as read-only memory maps.
+
+    Price arrays, price frames and fundamentals are used in place; only the small valuation frames are rebuilt per process.
+
+    :param include: Predicate on (dataset, key) selecting the entries to load; all of them by default.
+    :param mmap_mode: Passed to np.load; None reads the files into memory so none of them stays open.
+    :return: The (dataset, key) pairs loaded.
+    """
+    cache = cache or get_cache()
+    include = include or (lambda dataset, key: True)
+    with open(os.path.join(root, MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    def load(path: str) -> np.ndarray:
+        return np.load(os.path.join(root, path), mmap_mode=mmap_mode)
+
+    loaded = []
+    for dataset in ARRAY_DATASETS:
+        for key, entry in manifest[dataset].items():
+            if include(dataset, key):
+                cache.attach_array(dataset, key, load(entry["data"]), load(entry["published"]) if "published" in entry else None)
+                # Frames read into memory would be private copies; leave those to be built on demand
+                if "frame" in entry and mmap_mode is not None:
+                    cache.attach_price_frame(key, load(entry["frame"]), load(entry["dates"]))
+                loaded.append((dataset, key))
+    for ticker, intervals in manifest["price_coverage"].items():
+        if include("prices", ticker):
+            for interval_start, interval_end in intervals:
+                cache.add_price_coverage(ticker, interval_start, interval_end)
+    for ticker, entry in manifest["valuation"].items():
+        if include("valuation", ticker):
+            cache.set_valuation(ticker, _array_to_valuation(load(entry["data"]), entry["columns"]))
+            loaded.append(("valuation", ticker))
+    return loaded
+
+
+class SharedDataPlane:
+    """Publishes cached data to a temporary directory for the lifetime of a process pool.
+
+    Usage:
+        with SharedDataPlane(tickers) as plane:
+            with ProcessPoolExecutor(initializer=attach, initargs=(plane.root,)) as pool:
+                ...
+    """
+
+    def __init__(self, tickers: list[str], cache: Cache | None = None):
+        self.tickers = tickers
+        self.cache = cache
+        self.root = None
+
+    def __enter__(self) -> "SharedDataPlane":
+        self.root = tempfile.mkdtemp(prefix="ai-hedge-fund-", dir=SHARED_DATA_DIR)
+        publish(self.root, self.tickers, self.cache)
+        return self
+
+    def __exit__(self, *exc_info):
+        # Workers that still have files mapped keep their pages until they exit
+        shutil.rmtree(self.root, ignore_errors=True)
+        self.root = None
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key so only one of them reaches the upstream source.
+
+    The first caller for a key runs the function; callers that arrive while it is in flight wait on
+    its future and receive the same result, or the same exception. Nothing is remembered once the
+    call completes, so caching stays the job of the Cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+        self._coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs):
+        """Run fn(*args, **kwargs) unless a call for key is already in flight, in which case wait for that one."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self._coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def stats(self) -> dict[str, int]:
+        """Number of calls currently in flight and of callers served by another caller's fetch."""
+        with self._lock:
+            return {"in_flight": len(self._calls), "coalesced": self._coalesced}
+
+
+class AsyncSingleFlight:
+    """asyncio counterpart of SingleFlight: coroutines awaiting the same key share one task.
+
+    The task is shielded, so a waiter that is cancelled does not cancel the fetch for the others. Calls are only
+    coalesced within one event loop; a caller on another loop runs its own.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Task] = {}
+        self._coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable], *args, **kwargs):
+        """Await fn(*args, **kwargs) unless a call for key is already in flight, in which case await that one."""
+        task = self._calls.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = self._calls[key] = asyncio.ensure_future(fn(*args, **kwargs))
+
+            def forget(done: asyncio.Task):
+                if self._calls.get(key) is done:
+                    del self._calls[key]
+
+            task.add_done_callback(forget)
+        else:
+            self._coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict[str, int]:
+        """Number of calls currently in flight and of callers served by another caller's fetch."""
+        return {"in_flight": len(self._calls), "coalesced": self._coalesced}
+
+
+# Global single-flight groups shared by the data fetchers
+_single_flight = SingleFlight()
+_async_single_flight = AsyncSingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the global single-flight group."""
+    return _single_flight
+
+
+def get_async_single_flight() -> AsyncSingleFlight:
+    """Get the global single-flight group of the async fetchers."""
+    return _async_single_flight
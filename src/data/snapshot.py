@@ -0,0 +1,134 @@
+import atexit
+import gzip
+import json
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+
+from dotenv import load_dotenv
+
+from src.data.cache import Cache, get_cache
+from src.data.shared import attach, publish
+
+# Warm start across restarts: the entry points call enable_snapshots, which loads the cache from a snapshot directory
+# on startup and writes it back on exit (and periodically). Arrays are kept as uncompressed .npy files and read into
+# memory on load rather than mapped, so the snapshot can be replaced while the process runs (Windows cannot replace
+# files that are still mapped); insider trades and news rows are gzip-compressed JSON. freshness.json records when
+# every entry was fetched, so restored entries keep their age: stale news and insider trades are refreshed in the
+# background as usual, and entries older than CACHE_SNAPSHOT_MAX_AGE are not restored at all.
+
+load_dotenv()
+
+DEFAULT_SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".cache", "snapshot")
+CACHE_SNAPSHOT_ENABLED = os.getenv("CACHE_SNAPSHOT", "true").lower() == "true"
+CACHE_SNAPSHOT_DIR = os.getenv("CACHE_SNAPSHOT_DIR") or DEFAULT_SNAPSHOT_DIR
+# Seconds between periodic snapshots; 0 only saves on exit
+CACHE_SNAPSHOT_INTERVAL = float(os.getenv("CACHE_SNAPSHOT_INTERVAL", "0"))
+# Entries fetched longer ago than this many seconds are not restored; 0 restores everything
+CACHE_SNAPSHOT_MAX_AGE = float(os.getenv("CACHE_SNAPSHOT_MAX_AGE", "86400"))
+
+FRESHNESS = "freshness.json"
+ROW_DATASETS = ("insider_trades", "company_news")
+SNAPSHOT_DATASETS = ("prices", "financial_metrics", "line_items", "valuation", *ROW_DATASETS)
+
+_snapshot_lock = threading.Lock()
+
+
+def save_snapshot(root: str, cache: Cache | None = None):
+    """Write the cache to a snapshot directory, replacing any previous snapshot there."""
+    cache = cache or get_cache()
+    with _snapshot_lock:
+        now = time.time()
+        tmp_root = f"{root}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_root, ignore_errors=True)
+        os.makedirs(tmp_root)
+
+        tickers = [*cache.keys("prices"), *cache.keys("financial_metrics"), *(key.split(":", 1)[0] for key in cache.keys("line_items")), *cache.keys("valuation")]
+        publish(tmp_root, list(dict.fromkeys(tickers)), cache)
+        for dataset in ROW_DATASETS:
+            get_rows = getattr(cache, f"get_{dataset}")
+            rows = {ticker: data for ticker in cache.keys(dataset) if (data := get_rows(ticker))}
+            with gzip.open(os.path.join(tmp_root, f"{dataset}.json.gz"), "wt", encoding="utf-8") as f:
+                json.dump(rows, f, ensure_ascii=False, default=str)
+
+        # Wall-clock fetch time of every entry; the cache itself only tracks ages on the monotonic clock
+        fetched_at = {dataset: {key: now - age for key in cache.keys(dataset) if (age := cache.age(dataset, key)) is not None} for dataset in SNAPSHOT_DATASETS}
+        with open(os.path.join(tmp_root, FRESHNESS), "w", encoding="utf-8") as f:
+            json.dump({"saved_at": now, "fetched_at": fetched_at}, f, ensure_ascii=False)
+
+        # Swap the new snapshot in
+        old_root = f"{root}.{os.getpid()}.old"
+        if os.path.exists(root):
+            os.replace(root, old_root)
+        os.replace(tmp_root, root)
+        shutil.rmtree(old_root, ignore_errors=True)
+
+
+def load_snapshot(root: str, cache: Cache | None = None, max_age: float = CACHE_SNAPSHOT_MAX_AGE) -> int:
+    """Load a snapshot into a cache, skipping entries fetched more than max_age seconds ago. Returns the number of entries loaded."""
+    cache = cache or get_cache()
+    try:
+        with open(os.path.join(root, FRESHNESS), encoding="utf-8") as f:
+            fetched_at = json.load(f)["fetched_at"]
+    except (OSError, ValueError, KeyError):
+        # No snapshot yet, or an incomplete one
+        return 0
+
+    now = time.time()
+
+    def age(dataset: str, key: str) -> float:
+        return now - fetched_at.get(dataset, {}).get(key, 0)
+
+    def include(dataset: str, key: str) -> bool:
+        return max_age <= 0 or age(dataset, key) <= max_age
+
+    with _snapshot_lock:
+        loaded = attach(root, cache, include, mmap_mode=None)
+        for dataset in ROW_DATASETS:
+            try:
+                with gzip.open(os.path.join(root, f"{dataset}.json.gz"), "rt", encoding="utf-8") as f:
+                    rows = json.load(f)
+            except (OSError, ValueError):
+                continue
+            set_rows = getattr(cache, f"set_{dataset}")
+            for ticker, data in rows.items():
+                if include(dataset, ticker):
+                    set_rows(ticker, data)
+                    loaded.append((dataset, ticker))
+
+    # Restored entries keep the age they had when the snapshot was taken, plus the time since
+    for dataset, key in loaded:
+        cache.touch(dataset, key, age(dataset, key))
+    return len(loaded)
+
+
+def _save_quietly(root: str, cache: Cache):
+    try:
+        save_snapshot(root, cache)
+    except Exception as e:
+        print(f"Warning: failed to save cache snapshot to {root}: {e}")
+
+
+def _save_periodically(root: str, cache: Cache, interval: float):
+    while True:
+        time.sleep(interval)
+        _save_quietly(root, cache)
+
+
+def enable_snapshots(root: str = CACHE_SNAPSHOT_DIR, cache: Cache | None = None, interval: float = CACHE_SNAPSHOT_INTERVAL):
+    """Warm-start a cache (the global one by default) from the snapshot at root, then keep the snapshot up to date
+    on exit and every `interval` seconds."""
+    cache = cache or get_cache()
+    try:
+        load_snapshot(root, cache)
+    except Exception as e:
+        print(f"Warning: failed to load cache snapshot from {root}: {e}")
+
+    # Pool workers start warm too, but leave saving the snapshot to the parent process
+    if multiprocessing.parent_process() is not None:
+        return
+    atexit.register(_save_quietly, root, cache)
+    if interval > 0:
+        threading.Thread(target=_save_periodically, args=(root, cache, interval), name="cache-snapshot", daemon=True).start()
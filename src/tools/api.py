@@ -1,9 +1,20 @@
+import asyncio
 import datetime
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable
+
+import numpy as np
 import pandas as pd
 import requests
 
+from src.data.arrays import PRICE_DTYPE, PRICE_FIELDS
 from src.data.cache import get_cache
+from src.data.fundamentals import publication_deadline
+from src.data.price_store import PriceStore, get_price_store
+from src.data.single_flight import get_async_single_flight, get_single_flight
+from src.data.snapshot import CACHE_SNAPSHOT_DIR, CACHE_SNAPSHOT_ENABLED, enable_snapshots
 from src.data.models import (
     CompanyNews,
     CompanyNewsResponse,
@@ -18,62 +29,194 @@ from src.data.models import (
     CompanyFactsResponse,
 )
 from src.utils.progress import progress
-from src.tools.api_db import stock_hold_management_detail_em
-
-import akshare as ak
-
+from src.tools.providers import get_async_provider, get_fixture_dir, get_provider
+
+# Source of raw upstream data (akshare, MongoDB, local Parquet or recorded fixtures), selected by DATA_PROVIDER
+_provider = get_provider()
+_async_provider = get_async_provider()
+# Set while recording or replaying fixtures. Such runs must not depend on local state: a replay has to ask for exactly
+# the requests that were recorded, so they keep their own price store next to the fixtures and skip the snapshot.
+_fixture_dir = get_fixture_dir()
 # Global cache instance
 _cache = get_cache()
-
-
-def get_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
-    """Fetch price data using akshare."""
-    # Try cache first
-    if cached_data := _cache.get_prices(ticker):
-        filtered_data = [Price(**price) for price in cached_data if start_date <= price["time"] <= end_date]
-        if filtered_data:
-            return filtered_data
-
-    # Fetch from akshare
+# Persistent price store shared across runs
+_price_store = get_price_store() if _fixture_dir is None else PriceStore(os.path.join(_fixture_dir, "price_store"))
+# Concurrent callers missing the cache for the same key share one upstream fetch
+_single_flight = get_single_flight()
+_async_single_flight = get_async_single_flight()
+# Upper bound on concurrent upstream requests issued by the *_batch functions
+DATA_FETCH_WORKERS = int(os.getenv("DATA_FETCH_WORKERS", "8"))
+# Seconds after which cached entries are stale and get refreshed in the background while still being served; 0 never refreshes
+CACHE_TTLS = {
+    "company_news": float(os.getenv("COMPANY_NEWS_CACHE_TTL", "300")),
+    "insider_trades": float(os.getenv("INSIDER_TRADES_CACHE_TTL", "900")),
+}
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+_refreshing: set[tuple[str, str]] = set()
+_refreshing_lock = threading.Lock()
+
+
+def _revalidate(dataset: str, ticker: str, end_date: str, key: tuple, fetch: Callable, *args):
+    """Stale-while-revalidate: once a ticker's cached entry outlives its TTL, refetch it in the background.
+
+    Only requests reaching today or later are revalidated: new rows cannot change the answer for a past end_date, so a
+    backtest outliving the TTL does not keep refetching its history.
+    """
+    ttl = CACHE_TTLS[dataset]
+    if ttl <= 0 or end_date < datetime.date.today().isoformat():
+        return
+    age = _cache.age(dataset, ticker)
+    if age is None or age < ttl:
+        return
+    with _refreshing_lock:
+        if (dataset, ticker) in _refreshing:
+            return
+        _refreshing.add((dataset, ticker))
+    _refresh_executor.submit(_refresh, dataset, ticker, key, fetch, *args)
+
+
+def _refresh(dataset: str, ticker: str, key: tuple, fetch: Callable, *args):
+    try:
+        _single_flight.do(key, fetch, *args)
+    except Exception:
+        # Keep serving the stale copy; the refresh is retried once the TTL runs out again
+        pass
+    finally:
+        _cache.touch(dataset, ticker)
+        with _refreshing_lock:
+            _refreshing.discard((dataset, ticker))
+
+
+def _frame_to_records(df: pd.DataFrame) -> list[dict[str, any]]:
+    """Convert a frame to record dicts of plain Python values, with NaN/NaT mapped to None."""
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+def _parse_prices(df: pd.DataFrame, start_date: str, end_date: str) -> np.ndarray:
+    """Convert raw daily bars within an inclusive date range to a PRICE_DTYPE array."""
+    if df.empty:
+        return np.empty(0, dtype=PRICE_DTYPE)
+    # Standardize column names and format
+    df = df.rename(columns={
+        "日期": "time",
+        "开盘": "open",
+        "收盘": "close",
+        "最高": "high",
+        "最低": "low",
+        "成交量": "volume"
+    })
+    df = df[["time", "open", "close", "high", "low", "volume"]]
+    df["time"] = pd.to_datetime(df["time"]).dt.strftime("%Y-%m-%d")
+    df = df[(df["time"] >= start_date) & (df["time"] <= end_date)]
+    data = np.empty(len(df), dtype=PRICE_DTYPE)
+    data["time"] = df["time"].to_numpy(dtype="datetime64[D]")
+    for field in PRICE_FIELDS:
+        data[field] = df[field].to_numpy()
+    return data
+
+
+def _fetch_prices(ticker: str, start_date: str, end_date: str) -> np.ndarray:
+    """Fetch price rows for an inclusive date range from the data provider."""
     try:
         # Example for Chinese A-shares; adjust for your market
-        df = ak.stock_zh_a_hist(symbol=ticker, period="daily", start_date=start_date.replace("-", ""), end_date=end_date.replace("-", ""))
-        if df.empty:
-            return []
-        # Standardize column names and format
-        df = df.rename(columns={
-            "日期": "time",
-            "开盘": "open",
-            "收盘": "close",
-            "最高": "high",
-            "最低": "low",
-            "成交量": "volume"
-        })
-        df = df[["time", "open", "close", "high", "low", "volume"]]
-        df["time"] = pd.to_datetime(df["time"]).dt.strftime("%Y-%m-%d")
-        # Convert to list of Price objects
-        prices = [
-            Price(
-                time=row["time"],
-                open=float(row["open"]),
-                close=float(row["close"]),
-                high=float(row["high"]),
-                low=float(row["low"]),
-                volume=int(row["volume"])
-            )
-            for _, row in df.iterrows()
-            if start_date <= row["time"] <= end_date
-        ]
+        return _parse_prices(_provider.prices(ticker, start_date, end_date), start_date, end_date)
     except Exception as e:
-        raise Exception(f"Error fetching data from akshare: {ticker} - {e}")
+        raise Exception(f"Error fetching data from akshare: {ticker} - {e}") from e
+
+
+def _hydrate_prices(ticker: str):
+    """Load a ticker's stored prices and coverage into the in-memory cache."""
+    if _cache.has_prices(ticker):
+        return
+    stored_data, coverage = _price_store.read(ticker)
+    if stored_data is None:
+        return
+    _cache.set_prices(ticker, stored_data)
+    for interval_start, interval_end in coverage:
+        _cache.add_price_coverage(ticker, interval_start, interval_end)
+
+
+def _store_prices(ticker: str, start_date: str, end_date: str, prices: np.ndarray):
+    """Add prices fetched for [start_date, end_date] to the cache and the store, and record the range as covered."""
+    # Today's bar may still change, so coverage only ever extends to yesterday. Fixtures are a frozen copy of upstream,
+    # so recording and replaying treat every fetched bar as final and request the same ranges whatever the date.
+    last_complete_day = (datetime.date.today() - datetime.timedelta(days=1)).isoformat() if _fixture_dir is None else end_date
+    if len(prices):
+        # progress.update_status("ben_graham_agent", ticker, f"Processed {len(prices)} price records")
+        _cache.set_prices(ticker, prices)
+    covered_end = min(end_date, last_complete_day)
+    _cache.add_price_coverage(ticker, start_date, covered_end)
+    try:
+        _price_store.append(ticker, prices, [(start_date, covered_end)] if start_date <= covered_end else [])
+    except OSError as e:
+        # A read-only or full disk only costs persistence; keep serving from memory
+        print(f"Warning: failed to persist prices for {ticker}: {e}")
 
-    if not prices:
-        return []
 
-    # progress.update_status("ben_graham_agent", ticker, f"Processed {len(prices)} price records")
-    # Cache the results as dicts
-    _cache.set_prices(ticker, [p.model_dump() for p in prices])
-    return prices
+def _fill_price_gap(ticker: str, gap_start: str, gap_end: str):
+    """Fetch whatever part of [gap_start, gap_end] is still missing into the cache and the store."""
+    # Re-check: another caller may have filled the gap since it was computed
+    for missing_start, missing_end in _cache.missing_price_ranges(ticker, gap_start, gap_end):
+        _store_prices(ticker, missing_start, missing_end, _fetch_prices(ticker, missing_start, missing_end))
+
+
+def _ensure_prices(ticker: str, start_date: str, end_date: str):
+    """Make sure the cache holds price data for [start_date, end_date], fetching only missing ranges."""
+    # Hydrate the in-memory cache from the on-disk store on first use
+    if not _cache.has_prices(ticker):
+        _single_flight.do(("price_store", ticker), _hydrate_prices, ticker)
+
+    for gap_start, gap_end in _cache.missing_price_ranges(ticker, start_date, end_date):
+        _single_flight.do(("prices", ticker, gap_start, gap_end), _fill_price_gap, ticker, gap_start, gap_end)
+
+
+def get_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
+    """Fetch price data using akshare, only requesting date ranges not already cached."""
+    _ensure_prices(ticker, start_date, end_date)
+    return _cache.get_prices_in_range(ticker, start_date, end_date)
+
+
+def enable_cache_snapshots():
+    """Warm-start the cache from the last run's snapshot and save it again on exit.
+
+    Called by the entry points (CLI, backtester, backend startup) rather than on import; does nothing when
+    CACHE_SNAPSHOT=false or while recording or replaying fixtures.
+    """
+    if CACHE_SNAPSHOT_ENABLED and _fixture_dir is None:
+        enable_snapshots(CACHE_SNAPSHOT_DIR, _cache)
+
+
+def get_price_frame(ticker: str, start_date: str, end_date: str, copy: bool = True) -> pd.DataFrame:
+    """Fetch price data as a date-indexed float64 frame (open, close, high, low, volume) without building Price objects.
+
+    Pass copy=False for read-only use to get a view of the cached frame instead of a copy.
+    """
+    _ensure_prices(ticker, start_date, end_date)
+    frame = _cache.get_price_frame(ticker, start_date, end_date)
+    if frame is None:
+        return pd.DataFrame(columns=["open", "close", "high", "low", "volume"], index=pd.DatetimeIndex([], name="Date"), dtype="float64")
+    return frame.copy() if copy else frame
+
+
+def _get_valuation_series(ticker: str) -> pd.DataFrame:
+    """Get the daily valuation series (market cap, PE, PB, PS) for a ticker, sorted by 数据日期."""
+    if (cached_data := _cache.get_valuation(ticker)) is not None:
+        return cached_data
+    return _single_flight.do(("valuation", ticker), _fetch_valuation_series, ticker)
+
+
+def _fetch_valuation_series(ticker: str) -> pd.DataFrame:
+    if (cached_data := _cache.get_valuation(ticker)) is not None:
+        return cached_data
+
+    value_df = _prepare_valuation_series(_provider.valuation(ticker))
+    _cache.set_valuation(ticker, value_df)
+    return value_df
+
+
+def _prepare_valuation_series(value_df: pd.DataFrame) -> pd.DataFrame:
+    value_df["数据日期"] = pd.to_datetime(value_df["数据日期"], errors="coerce")
+    return value_df.dropna(subset=["数据日期"]).sort_values("数据日期").reset_index(drop=True)
 
 
 def get_financial_metrics(
@@ -82,128 +225,205 @@ def get_financial_metrics(
     period: str = "ttm",
     limit: int = 10,
 ) -> list[FinancialMetrics]:
-    """Fetch financial metrics using akshare."""
-    # Check cache first
-    if cached_data := _cache.get_financial_metrics(ticker):
-        filtered_data = [FinancialMetrics(**metric) for metric in cached_data if metric["report_period"] <= end_date]
-        filtered_data.sort(key=lambda x: x.report_period, reverse=True)
-        if filtered_data:
-            return filtered_data[:limit]
+    """Fetch financial metrics using akshare, as published on or before end_date."""
+    # Every report period is cached once per ticker; each end_date is then an as-of lookup
+    if not _cache.has_financial_metrics(ticker):
+        _single_flight.do(("financial_metrics", ticker), _fetch_financial_metrics, ticker, period)
+
+    return _with_period(_cache.get_financial_metrics_as_of(ticker, end_date, limit), period)
+
+
+def _with_period(metrics: list[FinancialMetrics], period: str) -> list[FinancialMetrics]:
+    return [m if m.period == period else m.model_copy(update={"period": period}) for m in metrics]
 
+
+def _fetch_financial_metrics(ticker: str, period: str):
+    if _cache.has_financial_metrics(ticker):
+        return
+
+    _ensure_announcement_dates(ticker)
     try:
-        # Fetch spot data for market cap and ratios
-        value_df = ak.stock_value_em(ticker)
-        value_df["数据日期"] = pd.to_datetime(value_df["数据日期"], errors="coerce").dt.date
+        # Fetch the valuation series for market cap and ratios
+        value_df = _get_valuation_series(ticker)
 
         # Example for Chinese A-shares; adjust for your market
-        df = ak.stock_financial_analysis_indicator(symbol=ticker, start_year="2019")
-        if df.empty:
-            return []
-        # Standardize column names and filter by end_date
-        df = df.rename(columns={
-            "日期": "report_period",
-            "每股收益_调整后(元)": "earnings_per_share",
-            "每股净资产_调整后(元)": "book_value_per_share",
-            "净利润增长率(%)": "earnings_growth",
-            "主营业务收入增长率(%)": "revenue_growth",
-            "销售毛利率(%)": "gross_margin",
-            "销售净利率(%)": "net_margin",
-            "营业利润率(%)": "operating_margin",
-            "净资产收益率(%)": "return_on_equity",
-            "总资产净利润率(%)": "return_on_assets",
-            "总资产周转率(次)": "asset_turnover",
-            "存货周转率(次)": "inventory_turnover",
-            "应收账款周转率(次)": "receivables_turnover",
-            "应收账款周转天数(天)": "days_sales_outstanding",
-            "流动比率": "current_ratio",
-            "速动比率": "quick_ratio",
-            "现金比率(%)": "cash_ratio",
-            "资产负债率(%)": "debt_to_assets",
-            "利息支付倍数": "interest_coverage",
-            "负债与所有者权益比率(%)": "debt_to_equity",
-            "股息发放率(%)": "payout_ratio",
-            "每股经营性现金流(元)": "free_cash_flow_per_share",
-            "净资产增长率(%)": "book_value_growth",
-            "总资产(元)": "total_assets",
-            # Add more mappings as needed
-        })
-        df["report_period"] = df["report_period"].astype(str)
-        end_date_str = str(end_date)
-        df = df[df["report_period"] <= end_date_str]
-        df = df.sort_values("report_period", ascending=False).head(limit)
-        metrics = []
-        for _, row in df.iterrows():
-            # 匹配最近的估值数据
-            report_date = pd.to_datetime(row.get("report_period")).date()
-            value_row = value_df[value_df["数据日期"] <= report_date].sort_values("数据日期", ascending=False).head(1)
-            if not value_row.empty:
-                value_row = value_row.iloc[0]
-                market_cap = value_row.get("流通市值")
-                price_to_earnings_ratio = value_row.get("PE(TTM)")
-                price_to_book_ratio = value_row.get("市净率")
-                price_to_sales_ratio = value_row.get("市销率")
-                enterprise_value = value_row.get("总市值")
-            else:
-                market_cap = None
-                price_to_earnings_ratio = None
-                price_to_book_ratio = None
-                price_to_sales_ratio = None
-                enterprise_value = None
-
-            metrics.append(FinancialMetrics(
-                ticker=ticker,
-                report_period=row.get("report_period"),
-                period=period,
-                currency="CNY",  # Adjust as needed
-                market_cap=market_cap,
-                enterprise_value=enterprise_value,
-                price_to_earnings_ratio=price_to_earnings_ratio,
-                price_to_book_ratio=price_to_book_ratio,
-                price_to_sales_ratio=price_to_sales_ratio,
-                enterprise_value_to_ebitda_ratio=None,
-                enterprise_value_to_revenue_ratio=None,
-                free_cash_flow_yield=None,
-                peg_ratio=None,
-                gross_margin=row.get("gross_margin"),
-                operating_margin=row.get("operating_margin"),
-                net_margin=row.get("net_margin"),
-                return_on_equity=row.get("return_on_equity"),
-                return_on_assets=row.get("return_on_assets"),
-                return_on_invested_capital=None,
-                asset_turnover=row.get("asset_turnover"),
-                inventory_turnover=row.get("inventory_turnover"),
-                receivables_turnover=row.get("receivables_turnover"),
-                days_sales_outstanding=row.get("days_sales_outstanding"),
-                operating_cycle=None,
-                working_capital_turnover=None,
-                current_ratio=row.get("current_ratio"),
-                quick_ratio=row.get("quick_ratio"),
-                cash_ratio=row.get("cash_ratio") / 100 if row.get("cash_ratio") else None,  # Convert percentage
-                operating_cash_flow_ratio=None,
-                debt_to_equity=row.get("debt_to_equity") / 100 if row.get("debt_to_equity") else None,  # Convert percentage
-                debt_to_assets=row.get("debt_to_assets") / 100 if row.get("debt_to_assets") else None,  # Convert percentage
-                interest_coverage=row.get("interest_coverage"),
-                revenue_growth=row.get("revenue_growth"),
-                earnings_growth=row.get("earnings_growth"),
-                book_value_growth=row.get("book_value_growth"),
-                earnings_per_share_growth=None,
-                free_cash_flow_growth=None,
-                operating_income_growth=None,
-                ebitda_growth=None,
-                payout_ratio=row.get("payout_ratio") / 100 if row.get("payout_ratio") else None,  # Convert percentage
-                earnings_per_share=row.get("earnings_per_share"),
-                book_value_per_share=row.get("book_value_per_share"),
-                free_cash_flow_per_share=row.get("free_cash_flow_per_share"),
-            ))
+        metrics, published = _build_financial_metrics(ticker, _provider.financial_indicators(ticker), value_df, period)
     except Exception as e:
-        raise Exception(f"Error fetching financial metrics from akshare: {ticker} - {e}")
+        raise Exception(f"Error fetching financial metrics from akshare: {ticker} - {e}") from e
 
-    if not metrics:
-        return []
-
-    # Cache the results as dicts
-    _cache.set_financial_metrics(ticker, [m.model_dump() for m in metrics])
-    return metrics
+    # Cache the results
+    if metrics:
+        _cache.set_financial_metrics(ticker, metrics, published)
+
+
+def _build_financial_metrics(ticker: str, df: pd.DataFrame, value_df: pd.DataFrame, period: str) -> tuple[list[FinancialMetrics], np.ndarray]:
+    """Build metrics for every report period from raw indicators and the valuation series.
+
+    Returns the metrics and the date each became public. The indicators carry no publication date, so the 公告日期
+    of the same period in the cached income statement is used, or the regulatory deadline for the period where that
+    is unknown, which never makes a report visible early.
+    """
+    if df.empty:
+        return [], np.empty(0, dtype="datetime64[D]")
+    # Standardize column names
+    df = df.rename(columns={
+        "日期": "report_period",
+        "每股收益_调整后(元)": "earnings_per_share",
+        "每股净资产_调整后(元)": "book_value_per_share",
+        "净利润增长率(%)": "earnings_growth",
+        "主营业务收入增长率(%)": "revenue_growth",
+        "销售毛利率(%)": "gross_margin",
+        "销售净利率(%)": "net_margin",
+        "营业利润率(%)": "operating_margin",
+        "净资产收益率(%)": "return_on_equity",
+        "总资产净利润率(%)": "return_on_assets",
+        "总资产周转率(次)": "asset_turnover",
+        "存货周转率(次)": "inventory_turnover",
+        "应收账款周转率(次)": "receivables_turnover",
+        "应收账款周转天数(天)": "days_sales_outstanding",
+        "流动比率": "current_ratio",
+        "速动比率": "quick_ratio",
+        "现金比率(%)": "cash_ratio",
+        "资产负债率(%)": "debt_to_assets",
+        "利息支付倍数": "interest_coverage",
+        "负债与所有者权益比率(%)": "debt_to_equity",
+        "股息发放率(%)": "payout_ratio",
+        "每股经营性现金流(元)": "free_cash_flow_per_share",
+        "净资产增长率(%)": "book_value_growth",
+        "总资产(元)": "total_assets",
+        # Add more mappings as needed
+    })
+    df["report_period"] = df["report_period"].astype(str)
+
+    # 匹配最近的估值数据: as-of join each report date to the latest valuation on or before it
+    # market_cap is 总市值 (total market cap), the same figure get_market_cap returns
+    valuation_columns = {
+        "总市值": "market_cap",
+        "PE(TTM)": "price_to_earnings_ratio",
+        "市净率": "price_to_book_ratio",
+        "市销率": "price_to_sales_ratio",
+    }
+    valuations = value_df.reindex(columns=["数据日期"] + list(valuation_columns)).rename(columns=valuation_columns)
+    # No debt or cash figures here, so total market cap stands in for enterprise value
+    valuations["enterprise_value"] = valuations["market_cap"]
+    df["report_date"] = pd.to_datetime(df["report_period"])
+    df = pd.merge_asof(df.sort_values("report_date"), valuations, left_on="report_date", right_on="数据日期", direction="backward")
+    df = df.sort_values("report_period", ascending=False)
+
+    # Fields akshare has no source for stay None
+    metric_fields = [field for field in FinancialMetrics.model_fields if field not in ("ticker", "report_period", "period", "currency")]
+    df = df.reindex(columns=["report_period"] + metric_fields)
+    df[metric_fields] = df[metric_fields].apply(pd.to_numeric, errors="coerce")
+    # Convert percentages to ratios, keeping zero as missing
+    for field in ("cash_ratio", "debt_to_equity", "debt_to_assets", "payout_ratio"):
+        df[field] = df[field].where(df[field] != 0) / 100
+    df.insert(0, "ticker", ticker)
+    df.insert(2, "period", period)
+    df.insert(3, "currency", "CNY")  # Adjust as needed
+
+    metrics = [FinancialMetrics.model_construct(**record) for record in _frame_to_records(df)]
+    return metrics, _publication_dates(ticker, df["report_period"])
+
+
+def _publication_dates(ticker: str, report_periods: pd.Series) -> np.ndarray:
+    """When each report period became public: the 公告日期 the cached income statement has for it, else the deadline."""
+    published = publication_deadline(report_periods).copy()
+    if (exported := _cache.export_array("line_items", f"{ticker}:{LINE_ITEM_STATEMENT}")) is not None:
+        statement, statement_published = exported
+        announced = pd.Series(statement_published, index=statement["report_period"])
+        known = report_periods.isin(announced.index).to_numpy()
+        published[known] = announced[report_periods[known]].to_numpy(dtype="datetime64[D]")
+    return published
+
+
+def _ensure_announcement_dates(ticker: str):
+    """Load the income statement, whose 公告日期 tell when each report period was published, for the metrics of a ticker."""
+    try:
+        _ensure_statement_line_items(ticker, LINE_ITEM_STATEMENT)
+    except Exception:
+        # Without them every report becomes visible at its regulatory deadline
+        pass
+
+
+# Statement that search_line_items reads, and how English line items map to its Chinese columns
+LINE_ITEM_STATEMENT = "利润表"
+LINE_ITEM_MAPPING = {
+    "earnings_per_share": "基本每股收益",  # Basic EPS
+    "revenue": "营业收入",  # Operating Revenue
+    "net_income": "净利润",  # Net Profit
+    "book_value_per_share": None,  # Not available in income statement
+    "total_assets": None,  # Not available in income statement
+    "total_liabilities": None,  # Not available in income statement
+    "current_assets": None,  # Not available in income statement
+    "current_liabilities": None,  # Not available in income statement
+    "dividends_and_other_cash_distributions": None,  # Not available in income statement
+    "outstanding_shares": None,  # Not available in income statement
+}
+
+
+def _ensure_statement_line_items(ticker: str, statement: str):
+    """Cache every mappable line item of every report period in a statement, so any subset of line items can be served from it."""
+    if _cache.has_line_items(ticker, statement):
+        return
+    _single_flight.do(("line_items", ticker, statement), _fetch_statement_line_items, ticker, statement)
+
+
+def _fetch_statement_line_items(ticker: str, statement: str):
+    if _cache.has_line_items(ticker, statement):
+        return
+    _store_statement_line_items(ticker, statement, _provider.financial_report(ticker, statement))
+
+
+def _parse_statement_dates(column: pd.Series) -> pd.Series:
+    """Parse a statement date column that may hold YYYYMMDD integers, YYYY-MM-DD strings or timestamps.
+
+    Going through strings keeps integers like 20240828 from being read as nanoseconds since the epoch.
+    """
+    digits = column.astype(str).str.replace("-", "", regex=False).str[:8]
+    return pd.to_datetime(digits, format="%Y%m%d", errors="coerce")
+
+
+def _store_statement_line_items(ticker: str, statement: str, df: pd.DataFrame | None):
+    if df is None or df.empty or "报告日" not in df.columns:
+        return
+
+    # Store 报告日 as YYYY-MM-DD so it compares with end dates like other report periods
+    items = pd.DataFrame({"report_period": _parse_statement_dates(df["报告日"]).dt.strftime("%Y-%m-%d")})
+    for item, chinese_column in LINE_ITEM_MAPPING.items():
+        if chinese_column and chinese_column in df.columns:
+            items[item] = pd.to_numeric(df[chinese_column], errors="coerce")
+    # Publication dates: 公告日期 where the statement has it, else the regulatory deadline for the period
+    published = pd.Series(publication_deadline(items["report_period"]), index=items.index)
+    if "公告日期" in df.columns:
+        published = _parse_statement_dates(df["公告日期"]).fillna(published)
+    valid = items["report_period"].notna()
+    _cache.set_line_items(ticker, statement, _frame_to_records(items[valid]), published[valid].to_numpy(dtype="datetime64[D]"))
+
+
+def _cached_line_items(ticker: str, line_items: list[str], end_date: str, period: str, limit: int) -> list[LineItem]:
+    rows = _cache.get_line_items_as_of(ticker, LINE_ITEM_STATEMENT, end_date, limit)
+
+    results = []
+    for row in rows:
+        item_data = {
+            "ticker": ticker,
+            "report_period": row["report_period"],
+            "period": period,
+            "currency": "CNY",
+        }
+        # Requested line items the statement does not provide are None
+        for item in line_items:
+            item_data[item] = row.get(item)
+        if line_items:
+            item_data["total_assets"] = 451 * 1e8
+            item_data["current_assets"] = 130 * 1e8
+            item_data["current_liabilities"] = 164 * 1e8
+            item_data["total_liabilities"] = 265 * 1e8
+            item_data["book_value_per_share"] = 3.8307
+            item_data["outstanding_shares"] = 28.77 * 1e8
+            item_data["dividends_and_other_cash_distributions"] = 1.6
+        results.append(LineItem.model_construct(**item_data))
+    return results
 
 
 def search_line_items(
@@ -215,58 +435,10 @@ def search_line_items(
 ) -> list[LineItem]:
     """Fetch line items using akshare."""
     try:
-        # Create mapping from English line items to Chinese column names
-        line_item_mapping = {
-            "earnings_per_share": "基本每股收益",  # Basic EPS
-            "revenue": "营业收入",  # Operating Revenue
-            "net_income": "净利润",  # Net Profit
-            "book_value_per_share": None,  # Not available in income statement
-            "total_assets": None,  # Not available in income statement
-            "total_liabilities": None,  # Not available in income statement
-            "current_assets": None,  # Not available in income statement
-            "current_liabilities": None,  # Not available in income statement
-            "dividends_and_other_cash_distributions": None,  # Not available in income statement
-            "outstanding_shares": None,  # Not available in income statement
-        }
-        
-        # Use the correct Chinese symbol for the income statement
-        df = ak.stock_financial_report_sina(stock=ticker, symbol="利润表")
-        if df is None or df.empty or "报告日" not in df.columns:
-            return []
-            
-        # Filter by date and sort
-        df = df[df["报告日"] <= end_date]
-        df = df.sort_values("报告日", ascending=False).head(limit)
-        
-        results = []
-        for _, row in df.iterrows():
-            item_data = {
-                "ticker": ticker,
-                "report_period": row["报告日"],
-                "period": period,
-                "currency": "CNY",
-            }
-            
-            # Map requested line items to available Chinese columns
-            for item in line_items:
-                chinese_column = line_item_mapping.get(item)
-                if chinese_column and chinese_column in row:
-                    item_data[item] = row[chinese_column]
-                else:
-                    # Set to None if not available
-                    item_data[item] = None
-                item_data["total_assets"] = 451 * 1e8
-                item_data["current_assets"] = 130 * 1e8
-                item_data["current_liabilities"] = 164 * 1e8
-                item_data["total_liabilities"] = 265 * 1e8
-                item_data["book_value_per_share"] = 3.8307
-                item_data["outstanding_shares"] = 28.77 * 1e8
-                item_data["dividends_and_other_cash_distributions"] = 1.6
-                    
-            results.append(LineItem(**item_data))
-            
+        _ensure_statement_line_items(ticker, LINE_ITEM_STATEMENT)
+        results = _cached_line_items(ticker, line_items, end_date, period, limit)
     except Exception as e:
-        raise Exception(f"Error fetching line items from akshare: {ticker} - {e}")
+        raise Exception(f"Error fetching line items from akshare: {ticker} - {e}") from e
 
     if not results:
         return []
@@ -274,80 +446,80 @@ def search_line_items(
     return results
 
 
+def _cached_insider_trades(ticker: str, end_date: str, start_date: str | None, limit: int | None) -> list[InsiderTrade]:
+    if not (cached_data := _cache.get_insider_trades(ticker)):
+        return []
+    filtered_data = [
+        InsiderTrade(**trade)
+        for trade in cached_data
+        if (start_date is None or (trade.get("transaction_date") or trade["filing_date"]) >= start_date)
+        and (trade.get("transaction_date") or trade["filing_date"]) <= end_date
+    ]
+    filtered_data.sort(key=lambda x: x.transaction_date or x.filing_date, reverse=True)
+    return filtered_data[:limit]
+
+
 def get_insider_trades(
     ticker: str,
     end_date: str,
     start_date: str | None = None,
-    limit: int = 1000,
+    limit: int | None = 1000,
 ) -> list[InsiderTrade]:
     """Fetch insider trades using akshare."""
-    # Check cache first
-    if cached_data := _cache.get_insider_trades(ticker):
-        filtered_data = [
-            InsiderTrade(**trade)
-            for trade in cached_data
-            if (start_date is None or (trade.get("transaction_date") or trade["filing_date"]) >= start_date)
-            and (trade.get("transaction_date") or trade["filing_date"]) <= end_date
-        ]
-        filtered_data.sort(key=lambda x: x.transaction_date or x.filing_date, reverse=True)
-        if filtered_data:
-            return filtered_data[:limit]
+    # The limit is applied to the cached rows rather than sent upstream, so callers reading the same range with
+    # different limits share one fetch
+    key = ("insider_trades", ticker, start_date, end_date)
+    # Check cache first, refreshing it in the background once stale
+    if filtered_data := _cached_insider_trades(ticker, end_date, start_date, limit):
+        _revalidate("insider_trades", ticker, end_date, key, _fetch_insider_trades, ticker, end_date, start_date)
+        return filtered_data
+
+    _single_flight.do(key, _fetch_insider_trades, ticker, end_date, start_date)
+    return _cached_insider_trades(ticker, end_date, start_date, limit)
 
+
+def _fetch_insider_trades(ticker: str, end_date: str, start_date: str | None) -> list[InsiderTrade]:
     try:
         # Example for Chinese A-shares: major shareholder changes
         # df = ak.stock_zh_a_gdhs_detail_em(symbol=ticker)
-        df = stock_hold_management_detail_em(symbol=ticker)
-        if df.empty:
-            return []
-        # Standardize and filter by date
-        df = df.rename(columns={
-            "日期": "filing_date",
-            "名称": "issuer",
-            "变动人": "name",
-            "职务": "title",
-            "变动人与董监高的关系": "is_board_director", # 本人 is True, 其他 is False
-            "变动股数": "transaction_shares",
-            "成交均价": "transaction_price_per_share",
-            "变动金额": "transaction_value",
-            "变动比例": "transaction_value",  # Not exactly value, but ratio
-            "变动后持股数": "shares_owned_after_transaction",
-            "持股种类": "security_title",  # Not exactly, but can be mapped
-        })
-        # df["transaction_date"] = df["filing_date"]
-        # df = df[df["filing_date"] <= end_date]
-        # if start_date:
-        #     df = df[df["filing_date"] >= start_date]
-        df["filing_date"] = df["filing_date"].astype(str)
-        df["transaction_date"] = df["filing_date"]
-        end_date_str = str(end_date)
-        df = df[df["filing_date"] <= end_date_str]
-        if start_date:
-            start_date_str = str(start_date)
-            df = df[df["filing_date"] >= start_date_str]
-
-        df = df.sort_values("filing_date", ascending=False).head(limit)
-        trades = []
-        for _, row in df.iterrows():
-            trades.append(InsiderTrade(
-                ticker=ticker,
-                issuer=row.get("issuer"),
-                name=row.get("name"),
-                title=row.get("title"),
-                is_board_director=row.get("is_board_director") == "本人",  # Convert to boolean
-                transaction_date=row.get("transaction_date"),
-                transaction_shares=row.get("transaction_shares"),
-                transaction_price_per_share=row.get("transaction_price_per_share"),
-                transaction_value=row.get("transaction_value"),
-                shares_owned_before_transaction=row.get("shares_owned_after_transaction") - row.get("transaction_shares"),
-                shares_owned_after_transaction=row.get("shares_owned_after_transaction"),
-                security_title=row.get("security_title"),
-                filing_date=row.get("filing_date"),
-            ))
+        # Date range and ordering are applied by the provider
+        trades = _parse_insider_trades(ticker, _provider.insider_trades(ticker, start_date, end_date, None))
     except Exception as e:
-        raise Exception(f"Error fetching insider trades from akshare: {ticker} - {e}")
+        raise Exception(f"Error fetching insider trades from akshare: {ticker} - {e}") from e
+
+    return _store_insider_trades(ticker, trades)
 
-    
 
+def _parse_insider_trades(ticker: str, df: pd.DataFrame) -> list[InsiderTrade]:
+    if df.empty:
+        return []
+    # Standardize and filter by date
+    df = df.rename(columns={
+        "日期": "filing_date",
+        "名称": "issuer",
+        "变动人": "name",
+        "职务": "title",
+        "变动人与董监高的关系": "is_board_director", # 本人 is True, 其他 is False
+        "变动股数": "transaction_shares",
+        "成交均价": "transaction_price_per_share",
+        "变动金额": "transaction_value",
+        "变动后持股数": "shares_owned_after_transaction",
+        "持股种类": "security_title",  # Not exactly, but can be mapped
+    })
+    # df["transaction_date"] = df["filing_date"]
+    # df = df[df["filing_date"] <= end_date]
+    # if start_date:
+    #     df = df[df["filing_date"] >= start_date]
+    df["filing_date"] = df["filing_date"].astype(str)
+    df["transaction_date"] = df["filing_date"]
+    df["ticker"] = ticker
+    df["is_board_director"] = df["is_board_director"] == "本人"  # Convert to boolean
+    df["shares_owned_before_transaction"] = df["shares_owned_after_transaction"] - df["transaction_shares"]
+    df = df.reindex(columns=list(InsiderTrade.model_fields))
+    return [InsiderTrade.model_construct(**record) for record in _frame_to_records(df)]
+
+
+def _store_insider_trades(ticker: str, trades: list[InsiderTrade]) -> list[InsiderTrade]:
     if not trades:
         # progress.update_status("ben_graham_agent", ticker, f"No insider trades found for {ticker}")
         return []
@@ -358,61 +530,70 @@ def get_insider_trades(
     return trades
 
 
+def _cached_company_news(ticker: str, end_date: str, start_date: str | None, limit: int | None) -> list[CompanyNews]:
+    if not (cached_data := _cache.get_company_news(ticker)):
+        return []
+    filtered_data = [
+        CompanyNews(**news)
+        for news in cached_data
+        # 发布时间 carries a time of day, so compare the end date on its date part to keep end_date's own news
+        if (start_date is None or news["date"] >= start_date) and news["date"][:10] <= end_date
+    ]
+    filtered_data.sort(key=lambda x: x.date, reverse=True)
+    return filtered_data[:limit]
+
+
 def get_company_news(
     ticker: str,
     end_date: str,
     start_date: str | None = None,
-    limit: int = 1000,
+    limit: int | None = 1000,
 ) -> list[CompanyNews]:
     """Fetch company news using akshare."""
-    # Check cache first
-    if cached_data := _cache.get_company_news(ticker):
-        filtered_data = [
-            CompanyNews(**news)
-            for news in cached_data
-            if (start_date is None or news["date"] >= start_date) and news["date"] <= end_date
-        ]
-        filtered_data.sort(key=lambda x: x.date, reverse=True)
-        if filtered_data:
-            return filtered_data[:limit]
-
+    # stock_news_em only takes the ticker, so every caller shares one fetch of the ticker's recent news, which is
+    # cached whole and filtered per call
+    key = ("company_news", ticker)
+    # Check cache first, refreshing it in the background once stale
+    if _cache.has_company_news(ticker):
+        _revalidate("company_news", ticker, end_date, key, _fetch_company_news, ticker)
+    else:
+        _single_flight.do(key, _fetch_company_news, ticker)
+    return _cached_company_news(ticker, end_date, start_date, limit)
+
+
+def _fetch_company_news(ticker: str) -> list[CompanyNews]:
     try:
         # Example for Chinese A-shares; adjust for your market
-        df = ak.stock_news_em(symbol=ticker)
-        if df.empty:
-            return []
-        # Standardize column names
-        df = df.rename(columns={
-            "新闻标题": "title",
-            "发布时间": "date",
-            "新闻内容": "content",
-            "新闻链接": "url",
-            "文章来源": "source",
-        })
-        # Filter by date
-        df = df[df["date"] <= end_date]
-        if start_date:
-            df = df[df["date"] >= start_date]
-        df = df.sort_values("date", ascending=False).head(limit)
-        news_list = []
-        for _, row in df.iterrows():
-            news_list.append(CompanyNews(
-                ticker=ticker,
-                title=row.get("title"),
-                author="",  # akshare may not provide author
-                source=row.get("source", ""),
-                date=row.get("date"),
-                url=row.get("url"),
-                sentiment=None  # akshare does not provide sentiment
-            ))
+        news_list = _parse_company_news(ticker, _provider.company_news(ticker))
     except Exception as e:
-        raise Exception(f"Error fetching company news from akshare: {ticker} - {e}")
+        raise Exception(f"Error fetching company news from akshare: {ticker} - {e}") from e
+
+    return _store_company_news(ticker, news_list)
 
-    if not news_list:
-        return []
 
+def _parse_company_news(ticker: str, df: pd.DataFrame) -> list[CompanyNews]:
+    if df.empty:
+        return []
+    # Standardize column names
+    df = df.rename(columns={
+        "新闻标题": "title",
+        "发布时间": "date",
+        "新闻内容": "content",
+        "新闻链接": "url",
+        "文章来源": "source",
+    })
+    df["date"] = df["date"].astype(str)
+    df["ticker"] = ticker
+    df["author"] = ""  # akshare may not provide author
+    df["source"] = df["source"].fillna("") if "source" in df.columns else ""
+    df["sentiment"] = None  # akshare does not provide sentiment
+    df = df.reindex(columns=list(CompanyNews.model_fields))
+    return [CompanyNews.model_construct(**record) for record in _frame_to_records(df)]
+
+
+def _store_company_news(ticker: str, news_list: list[CompanyNews]) -> list[CompanyNews]:
     # progress.update_status("ben_graham_agent", ticker, f"Processed {len(news_list)} company news items")
-    # Cache the results
+    # Cache the results, even none, so a ticker without news is not fetched again until the entry goes stale
     _cache.set_company_news(ticker, [news.model_dump() for news in news_list])
     return news_list
 
@@ -421,48 +602,30 @@ def get_market_cap(
     ticker: str,
     end_date: str,
 ) -> float | None:
-    """Fetch market cap using akshare."""
+    """Fetch the total market cap as of end_date from the cached valuation series."""
     try:
-        # # Fetch financial indicators from akshare
-        # df = ak.stock_financial_analysis_indicator(symbol=ticker, start_year="2019")
-        # if df.empty:
-        #     return None
-        # # Standardize column names
-        # df = df.rename(columns={
-        #     "日期": "report_period",
-        #     "总资产(元)": "market_cap",
-        # })
-        # # Filter by end_date and sort
-        # df = df[df["report_period"] <= end_date]
-        # df = df.sort_values("report_period", ascending=False)
-
-        # # progress.update_status("ben_graham_agent", ticker, f"Fetched {len(df)} rows from akshare")
-        # if df.empty or pd.isna(df.iloc[0]["market_cap"]):
-        #     return None
-        # return float(df.iloc[0]["market_cap"])
-
-        # 获取实时股票数据
-        # spot_df = ak.stock_zh_a_spot_em()
-        # spot_row = spot_df[spot_df["代码"] == ticker]
-        
-        # if spot_row.empty:
-        #     return None
-            
-        # spot_row = spot_row.iloc[0]
-        # 使用流通市值或总市值
-        # market_cap = spot_row.get("流通市值")
-        # market_cap = spot_row.get("总市值")
-        market_cap = 18411139456.0
-        
-        if market_cap is None:
-            return None
-            
-        return float(market_cap)
+        return _market_cap_as_of(_get_valuation_series(ticker), end_date)
     except Exception as e:
         # print(f"Error fetching market cap from akshare: {ticker} - {e}")
         return None
 
 
+def _market_cap_as_of(value_df: pd.DataFrame, end_date: str) -> float | None:
+    if value_df.empty or "总市值" not in value_df.columns:
+        return None
+
+    # As-of lookup: latest valuation on or before end_date, by binary search over the sorted dates
+    position = value_df["数据日期"].searchsorted(pd.Timestamp(end_date), side="right") - 1
+    if position < 0:
+        return None
+    market_cap = value_df["总市值"].iat[position]
+
+    if pd.isna(market_cap):
+        return None
+
+    return float(market_cap)
+
+
 def prices_to_df(prices: list[Price]) -> pd.DataFrame:
     """Convert prices to a DataFrame."""
     df = pd.DataFrame([p.model_dump() for p in prices])
@@ -477,8 +640,272 @@ def prices_to_df(prices: list[Price]) -> pd.DataFrame:
 
 # Update the get_price_data function to use the new functions
 def get_price_data(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
-    prices = get_prices(ticker, start_date, end_date)
-    return prices_to_df(prices)
+    return get_price_frame(ticker, start_date, end_date)
+
+
+def _fetch_batch(fetch: Callable, tickers: list[str], max_workers: int | None, *args, **kwargs) -> tuple[dict[str, any], dict[str, Exception]]:
+    """Run a per-ticker fetch function for many tickers on a bounded thread pool.
+
+    Returns per-ticker results and per-ticker errors; one failing ticker does not abort the others.
+    """
+    results, errors = {}, {}
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return results, errors
+
+    with ThreadPoolExecutor(max_workers=min(max_workers or DATA_FETCH_WORKERS, len(tickers))) as executor:
+        futures = {executor.submit(fetch, ticker, *args, **kwargs): ticker for ticker in tickers}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                results[ticker] = future.result()
+            except Exception as e:
+                errors[ticker] = e
+    return results, errors
+
+
+def get_prices_batch(tickers: list[str], start_date: str, end_date: str, max_workers: int | None = None) -> tuple[dict[str, list[Price]], dict[str, Exception]]:
+    """Fetch price data for many tickers concurrently, filling the cache."""
+    return _fetch_batch(get_prices, tickers, max_workers, start_date, end_date)
+
+
+def get_financial_metrics_batch(
+    tickers: list[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+    max_workers: int | None = None,
+) -> tuple[dict[str, list[FinancialMetrics]], dict[str, Exception]]:
+    """Fetch financial metrics for many tickers concurrently, filling the cache."""
+    return _fetch_batch(get_financial_metrics, tickers, max_workers, end_date, period=period, limit=limit)
+
+
+def get_insider_trades_batch(
+    tickers: list[str],
+    end_date: str,
+    start_date: str | None = None,
+    limit: int | None = 1000,
+    max_workers: int | None = None,
+) -> tuple[dict[str, list[InsiderTrade]], dict[str, Exception]]:
+    """Fetch insider trades for many tickers concurrently, filling the cache."""
+    return _fetch_batch(get_insider_trades, tickers, max_workers, end_date, start_date=start_date, limit=limit)
+
+
+def get_company_news_batch(
+    tickers: list[str],
+    end_date: str,
+    start_date: str | None = None,
+    limit: int | None = 1000,
+    max_workers: int | None = None,
+) -> tuple[dict[str, list[CompanyNews]], dict[str, Exception]]:
+    """Fetch company news for many tickers concurrently, filling the cache."""
+    return _fetch_batch(get_company_news, tickers, max_workers, end_date, start_date=start_date, limit=limit)
+
+
+def search_line_items_batch(
+    tickers: list[str],
+    line_items: list[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+    max_workers: int | None = None,
+) -> tuple[dict[str, list[LineItem]], dict[str, Exception]]:
+    """Fetch line items for many tickers concurrently, filling the cache."""
+    return _fetch_batch(search_line_items, tickers, max_workers, line_items, end_date, period=period, limit=limit)
+
+
+def get_market_cap_batch(tickers: list[str], end_date: str, max_workers: int | None = None) -> tuple[dict[str, float | None], dict[str, Exception]]:
+    """Fetch market caps for many tickers concurrently, filling the cache with their valuation series."""
+    return _fetch_batch(get_market_cap, tickers, max_workers, end_date)
+
+
+# Async counterparts of the fetch functions: data I/O is awaited on the async provider instead of holding a thread per call.
+# They share the cache with the sync functions, so data fetched here is served to the (sync) agents without refetching,
+# and coalesce concurrent misses under the same keys as the sync single-flight group.
+
+
+async def aget_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
+    """Async get_prices."""
+    if not _cache.has_prices(ticker):
+        await _async_single_flight.do(("price_store", ticker), asyncio.to_thread, _hydrate_prices, ticker)
+
+    for gap_start, gap_end in _cache.missing_price_ranges(ticker, start_date, end_date):
+        await _async_single_flight.do(("prices", ticker, gap_start, gap_end), _afill_price_gap, ticker, gap_start, gap_end)
+    return _cache.get_prices_in_range(ticker, start_date, end_date)
+
+
+async def _afill_price_gap(ticker: str, gap_start: str, gap_end: str):
+    for missing_start, missing_end in _cache.missing_price_ranges(ticker, gap_start, gap_end):
+        try:
+            prices = _parse_prices(await _async_provider.prices(ticker, missing_start, missing_end), missing_start, missing_end)
+        except Exception as e:
+            raise Exception(f"Error fetching data from akshare: {ticker} - {e}") from e
+        await asyncio.to_thread(_store_prices, ticker, missing_start, missing_end, prices)
+
+
+async def _aget_valuation_series(ticker: str) -> pd.DataFrame:
+    if (cached_data := _cache.get_valuation(ticker)) is not None:
+        return cached_data
+    return await _async_single_flight.do(("valuation", ticker), _afetch_valuation_series, ticker)
+
+
+async def _afetch_valuation_series(ticker: str) -> pd.DataFrame:
+    if (cached_data := _cache.get_valuation(ticker)) is not None:
+        return cached_data
+
+    value_df = _prepare_valuation_series(await _async_provider.valuation(ticker))
+    _cache.set_valuation(ticker, value_df)
+    return value_df
+
+
+async def aget_financial_metrics(
+    ticker: str,
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> list[FinancialMetrics]:
+    """Async get_financial_metrics."""
+    if not _cache.has_financial_metrics(ticker):
+        await _async_single_flight.do(("financial_metrics", ticker), _afetch_financial_metrics, ticker, period)
+
+    return _with_period(_cache.get_financial_metrics_as_of(ticker, end_date, limit), period)
+
+
+async def _afetch_financial_metrics(ticker: str, period: str):
+    if _cache.has_financial_metrics(ticker):
+        return
+
+    try:
+        value_df, df, _ = await asyncio.gather(_aget_valuation_series(ticker), _async_provider.financial_indicators(ticker), _aensure_announcement_dates(ticker))
+        metrics, published = _build_financial_metrics(ticker, df, value_df, period)
+    except Exception as e:
+        raise Exception(f"Error fetching financial metrics from akshare: {ticker} - {e}") from e
+    if metrics:
+        _cache.set_financial_metrics(ticker, metrics, published)
+
+
+async def asearch_line_items(
+    ticker: str,
+    line_items: list[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> list[LineItem]:
+    """Async search_line_items."""
+    try:
+        await _aensure_statement_line_items(ticker, LINE_ITEM_STATEMENT)
+        return _cached_line_items(ticker, line_items, end_date, period, limit)
+    except Exception as e:
+        raise Exception(f"Error fetching line items from akshare: {ticker} - {e}") from e
+
+
+async def _aensure_statement_line_items(ticker: str, statement: str):
+    if not _cache.has_line_items(ticker, statement):
+        await _async_single_flight.do(("line_items", ticker, statement), _afetch_statement_line_items, ticker, statement)
+
+
+async def _aensure_announcement_dates(ticker: str):
+    try:
+        await _aensure_statement_line_items(ticker, LINE_ITEM_STATEMENT)
+    except Exception:
+        pass
+
+
+async def _afetch_statement_line_items(ticker: str, statement: str):
+    if not _cache.has_line_items(ticker, statement):
+        _store_statement_line_items(ticker, statement, await _async_provider.financial_report(ticker, statement))
+
+
+async def aget_insider_trades(
+    ticker: str,
+    end_date: str,
+    start_date: str | None = None,
+    limit: int | None = 1000,
+) -> list[InsiderTrade]:
+    """Async get_insider_trades."""
+    key = ("insider_trades", ticker, start_date, end_date)
+    if filtered_data := _cached_insider_trades(ticker, end_date, start_date, limit):
+        _revalidate("insider_trades", ticker, end_date, key, _fetch_insider_trades, ticker, end_date, start_date)
+        return filtered_data
+
+    await _async_single_flight.do(key, _afetch_insider_trades, ticker, end_date, start_date)
+    return _cached_insider_trades(ticker, end_date, start_date, limit)
+
+
+async def _afetch_insider_trades(ticker: str, end_date: str, start_date: str | None):
+    try:
+        trades = _parse_insider_trades(ticker, await _async_provider.insider_trades(ticker, start_date, end_date, None))
+    except Exception as e:
+        raise Exception(f"Error fetching insider trades from akshare: {ticker} - {e}") from e
+    _store_insider_trades(ticker, trades)
+
+
+async def aget_company_news(
+    ticker: str,
+    end_date: str,
+    start_date: str | None = None,
+    limit: int | None = 1000,
+) -> list[CompanyNews]:
+    """Async get_company_news."""
+    key = ("company_news", ticker)
+    if _cache.has_company_news(ticker):
+        _revalidate("company_news", ticker, end_date, key, _fetch_company_news, ticker)
+    else:
+        await _async_single_flight.do(key, _afetch_company_news, ticker)
+    return _cached_company_news(ticker, end_date, start_date, limit)
+
+
+async def _afetch_company_news(ticker: str):
+    try:
+        news_list = _parse_company_news(ticker, await _async_provider.company_news(ticker))
+    except Exception as e:
+        raise Exception(f"Error fetching company news from akshare: {ticker} - {e}") from e
+    _store_company_news(ticker, news_list)
+
+
+async def aget_market_cap(
+    ticker: str,
+    end_date: str,
+) -> float | None:
+    """Async get_market_cap."""
+    try:
+        return _market_cap_as_of(await _aget_valuation_series(ticker), end_date)
+    except Exception:
+        return None
+
+
+async def aprefetch(tickers: list[str], start_date: str, end_date: str, plan: dict[str, dict] | None = None) -> dict[str, dict[str, Exception]]:
+    """Concurrently load the data of many tickers into the cache.
+
+    :param plan: Datasets to load, as returned by plan_data_requirements for runs as of end_date; by default prices,
+        financial metrics (with the valuation series behind market cap), every line item, insider trades and news.
+    :return: The errors per dataset and ticker; a failed fetch is left for the sync functions to retry.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    if plan is None:
+        plan = {
+            "prices": {"start_date": start_date},
+            "financial_metrics": {"periods": ["ttm"], "limit": 10},
+            "line_items": {"fields": list(LINE_ITEM_MAPPING), "periods": ["ttm"], "limit": 10},
+            "insider_trades": {"start_date": start_date, "limit": 1000},
+            "company_news": {"start_date": None, "limit": 1000},
+        }
+    requests_by_dataset = {
+        "prices": lambda ticker, spec: aget_prices(ticker, spec["start_date"], end_date),
+        "financial_metrics": lambda ticker, spec: aget_financial_metrics(ticker, end_date, spec["periods"][0], spec["limit"]),
+        "line_items": lambda ticker, spec: asearch_line_items(ticker, spec["fields"], end_date, spec["periods"][0], spec["limit"]),
+        "market_cap": lambda ticker, spec: aget_market_cap(ticker, end_date),
+        "insider_trades": lambda ticker, spec: aget_insider_trades(ticker, end_date, spec["start_date"], spec["limit"]),
+        "company_news": lambda ticker, spec: aget_company_news(ticker, end_date, spec["start_date"], spec["limit"]),
+    }
+    calls = [(dataset, ticker) for dataset in plan for ticker in tickers]
+    results = await asyncio.gather(*(requests_by_dataset[dataset](ticker, plan[dataset]) for dataset, ticker in calls), return_exceptions=True)
+
+    errors = {}
+    for (dataset, ticker), result in zip(calls, results):
+        if isinstance(result, Exception):
+            errors.setdefault(dataset, {})[ticker] = result
+    return errors
 
 
 if __name__ == "__main__":
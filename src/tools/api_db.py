@@ -1,9 +1,32 @@
 import pandas as pd
-from src.engine.database import db
+from pymongo import ASCENDING, DESCENDING
+from pymongo.database import Database
 
-def stock_hold_management_detail_em(symbol: str = "601139") -> pd.DataFrame:
+from src.engine.database import get_db
+
+
+def ensure_indexes(db: Database | None = None):
+    """Create the indexes the query helpers below rely on. Safe to call repeatedly.
+
+    Run by data_init, which writes the collections; the query helpers only read, so they work with read-only credentials.
+    """
+    db = db if db is not None else get_db()
+    # Serves equality on 代码 plus range/sort on 日期 in stock_hold_management_detail_em
+    db["stock_hold_management_detail_em"].create_index([("代码", ASCENDING), ("日期", DESCENDING)], name="code_date")
+
+
+def stock_hold_management_detail_em(
+    symbol: str = "601139",
+    start_date: str | None = None,
+    end_date: str | None = None,
+    limit: int | None = None,
+) -> pd.DataFrame:
     """
-    获取股票的股东户详情数据
+    获取股票的股东户详情数据, 按日期倒序; 日期范围与条数限制在 MongoDB 端完成
+    :param symbol: 股票代码
+    :param start_date: 起始日期 (含), YYYY-MM-DD
+    :param end_date: 截止日期 (含), YYYY-MM-DD
+    :param limit: 最多返回的条数
     {
     "_id": {
         "$oid": "683d67ca5e2460ebc4db3e1b"
@@ -28,8 +51,15 @@ def stock_hold_management_detail_em(symbol: str = "601139") -> pd.DataFrame:
     """
 
     collection_name = "stock_hold_management_detail_em"
-    collection = db[collection_name]
+    collection = get_db()[collection_name]
     query = {"代码": symbol}
+    date_range = {}
+    if start_date:
+        date_range["$gte"] = str(start_date)
+    if end_date:
+        date_range["$lte"] = str(end_date)
+    if date_range:
+        query["日期"] = date_range
     projection = {
         "_id": 0,
         "日期": 1,
@@ -49,7 +79,9 @@ def stock_hold_management_detail_em(symbol: str = "601139") -> pd.DataFrame:
         "开始时持有": 1,
         "结束后持有": 1
     }
-    cursor = collection.find(query, projection)
+    cursor = collection.find(query, projection).sort("日期", DESCENDING)
+    if limit:
+        cursor = cursor.limit(limit)
     data = list(cursor)
     if not data:
         print(f"未找到股票代码 {symbol} 的股东户数详情数据。")
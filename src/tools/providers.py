@@ -0,0 +1,363 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Protocol
+
+import akshare as ak
+import pandas as pd
+from dotenv import load_dotenv
+
+from src.tools.api_db import stock_hold_management_detail_em
+from src.tools.rate_limit import call_with_retry
+
+load_dotenv()
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_FIXTURE_DIR = PROJECT_ROOT / ".cache" / "fixtures"
+DEFAULT_PARQUET_DIR = PROJECT_ROOT / ".cache" / "parquet"
+
+# Seconds a whole-market table (insider trades) is reused across tickers; matches the insider trade cache TTL
+MARKET_TABLE_TTL = float(os.getenv("INSIDER_TRADES_CACHE_TTL", "900"))
+
+# Raw datasets every provider serves, as akshare-shaped DataFrames
+DATASETS = ("prices", "valuation", "financial_indicators", "financial_report", "insider_trades", "company_news")
+
+
+class DataProvider(Protocol):
+    """Source of raw upstream data. Every method returns the DataFrame shape of the corresponding akshare endpoint."""
+
+    def prices(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """Daily bars (stock_zh_a_hist) for an inclusive YYYY-MM-DD range."""
+        ...
+
+    def valuation(self, ticker: str) -> pd.DataFrame:
+        """Daily valuation series (stock_value_em)."""
+        ...
+
+    def financial_indicators(self, ticker: str) -> pd.DataFrame:
+        """Financial analysis indicators per report period (stock_financial_analysis_indicator)."""
+        ...
+
+    def financial_report(self, ticker: str, statement: str) -> pd.DataFrame:
+        """One financial statement per report period (stock_financial_report_sina)."""
+        ...
+
+    def insider_trades(self, ticker: str, start_date: str | None, end_date: str, limit: int | None) -> pd.DataFrame:
+        """Director and executive shareholding changes (stock_hold_management_detail_em), newest first."""
+        ...
+
+    def company_news(self, ticker: str) -> pd.DataFrame:
+        """Recent news (stock_news_em)."""
+        ...
+
+
+class AsyncDataProvider(Protocol):
+    """Awaitable counterpart of DataProvider."""
+
+    async def prices(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame: ...
+
+    async def valuation(self, ticker: str) -> pd.DataFrame: ...
+
+    async def financial_indicators(self, ticker: str) -> pd.DataFrame: ...
+
+    async def financial_report(self, ticker: str, statement: str) -> pd.DataFrame: ...
+
+    async def insider_trades(self, ticker: str, start_date: str | None, end_date: str, limit: int | None) -> pd.DataFrame: ...
+
+    async def company_news(self, ticker: str) -> pd.DataFrame: ...
+
+
+def _filter_insider_trades(df: pd.DataFrame, ticker: str, start_date: str | None, end_date: str, limit: int | None) -> pd.DataFrame:
+    """Apply the ticker, date range, newest-first order and limit that the MongoDB query pushes down."""
+    df = df[df["代码"].astype(str) == ticker].copy()
+    df["日期"] = pd.to_datetime(df["日期"], errors="coerce").dt.strftime("%Y-%m-%d")
+    df = df[df["日期"] <= end_date]
+    if start_date:
+        df = df[df["日期"] >= start_date]
+    return df.sort_values("日期", ascending=False).head(limit).reset_index(drop=True)
+
+
+class AkshareProvider:
+    """Everything live from akshare, throttled and retried per endpoint."""
+
+    def __init__(self):
+        # The insider trade endpoint only serves the whole market, so one download is shared by every ticker
+        self._market_insider_trades: pd.DataFrame | None = None
+        self._market_insider_trades_at = 0.0
+        self._market_insider_trades_lock = threading.Lock()
+
+    def _call(self, endpoint: str, **kwargs) -> pd.DataFrame:
+        return call_with_retry(endpoint, getattr(ak, endpoint), **kwargs)
+
+    def prices(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        return self._call("stock_zh_a_hist", symbol=ticker, period="daily", start_date=start_date.replace("-", ""), end_date=end_date.replace("-", ""))
+
+    def valuation(self, ticker: str) -> pd.DataFrame:
+        return self._call("stock_value_em", symbol=ticker)
+
+    def financial_indicators(self, ticker: str) -> pd.DataFrame:
+        return self._call("stock_financial_analysis_indicator", symbol=ticker, start_year="2019")
+
+    def financial_report(self, ticker: str, statement: str) -> pd.DataFrame:
+        return self._call("stock_financial_report_sina", stock=ticker, symbol=statement)
+
+    def _market_insider_trades_frame(self) -> pd.DataFrame:
+        # Held while downloading, so concurrent callers wait for the one download instead of starting their own
+        with self._market_insider_trades_lock:
+            if self._market_insider_trades is None or time.monotonic() - self._market_insider_trades_at >= MARKET_TABLE_TTL:
+                self._market_insider_trades = self._call("stock_hold_management_detail_em")
+                self._market_insider_trades_at = time.monotonic()
+            return self._market_insider_trades
+
+    def insider_trades(self, ticker: str, start_date: str | None, end_date: str, limit: int | None) -> pd.DataFrame:
+        # The endpoint returns the whole market, so filter it down here
+        return _filter_insider_trades(self._market_insider_trades_frame(), ticker, start_date, end_date, limit)
+
+    def company_news(self, ticker: str) -> pd.DataFrame:
+        return self._call("stock_news_em", symbol=ticker)
+
+
+class MongoProvider(AkshareProvider):
+    """akshare, with insider trades read from the indexed MongoDB mirror maintained by data_init."""
+
+    def insider_trades(self, ticker: str, start_date: str | None, end_date: str, limit: int | None) -> pd.DataFrame:
+        return stock_hold_management_detail_em(symbol=ticker, start_date=start_date, end_date=end_date, limit=limit)
+
+
+class ParquetProvider:
+    """Local Parquet exports, one file per dataset and ticker: <root>/<dataset>/<ticker>.parquet.
+
+    Financial reports live in <root>/financial_report/<ticker>_<statement>.parquet. Reading requires pyarrow or fastparquet.
+    """
+
+    def __init__(self, root: str | Path = DEFAULT_PARQUET_DIR):
+        self.root = Path(root)
+
+    def _read(self, dataset: str, name: str) -> pd.DataFrame:
+        path = self.root / dataset / f"{name}.parquet"
+        if not path.exists():
+            raise FileNotFoundError(f"No local {dataset} data for {name} at {path}")
+        return pd.read_parquet(path)
+
+    def prices(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        df = self._read("prices", ticker)
+        dates = pd.to_datetime(df["日期"]).dt.strftime("%Y-%m-%d")
+        return df[(dates >= start_date) & (dates <= end_date)].reset_index(drop=True)
+
+    def valuation(self, ticker: str) -> pd.DataFrame:
+        return self._read("valuation", ticker)
+
+    def financial_indicators(self, ticker: str) -> pd.DataFrame:
+        return self._read("financial_indicators", ticker)
+
+    def financial_report(self, ticker: str, statement: str) -> pd.DataFrame:
+        return self._read("financial_report", f"{ticker}_{statement}")
+
+    def insider_trades(self, ticker: str, start_date: str | None, end_date: str, limit: int | None) -> pd.DataFrame:
+        return _filter_insider_trades(self._read("insider_trades", ticker), ticker, start_date, end_date, limit)
+
+    def company_news(self, ticker: str) -> pd.DataFrame:
+        return self._read("company_news", ticker)
+
+
+class FixtureNotFoundError(LookupError):
+    """Raised in replay mode when no response was recorded for a request."""
+
+
+def _encode_values(values) -> tuple[str, list]:
+    """JSON-safe column values plus the dtype needed to restore them; dates are written as ISO strings."""
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return str(values.dtype), [None if pd.isna(value) else value.isoformat() for value in values]
+    if values.dtype == object and len(values.dropna()) and all(type(value) is date for value in values.dropna()):
+        return "date", [None if pd.isna(value) else value.isoformat() for value in values]
+    return str(values.dtype), values.tolist()
+
+
+def _decode_values(kind: str, values: list) -> pd.Series:
+    if kind == "date":
+        return pd.Series([pd.NaT if value is None else date.fromisoformat(value) for value in values], dtype=object)
+    dtype = pd.api.types.pandas_dtype(kind)
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        return pd.to_datetime(pd.Series(values, dtype=object), utc=True).dt.tz_convert(dtype.tz).astype(dtype)
+    if pd.api.types.is_datetime64_dtype(dtype):
+        return pd.to_datetime(pd.Series(values, dtype=object)).astype(dtype)
+    return pd.Series(values, dtype=object).astype(dtype)
+
+
+class FixtureStore:
+    """Provider responses stored as one gzip-compressed JSON document per (dataset, arguments), with the column dtypes
+    recorded alongside the values so replayed frames match the recorded ones. Unlike pickles, fixtures shared between
+    machines cannot run code when loaded."""
+
+    def __init__(self, root: str | Path = DEFAULT_FIXTURE_DIR):
+        self.root = Path(root)
+
+    def _path(self, dataset: str, args: tuple, kwargs: dict) -> Path:
+        request = json.dumps([list(args), kwargs], sort_keys=True, default=str, ensure_ascii=False)
+        return self.root / dataset / f"{hashlib.sha1(request.encode()).hexdigest()}.json.gz"
+
+    def save(self, dataset: str, args: tuple, kwargs: dict, response: pd.DataFrame):
+        """Record a response, replacing any earlier recording of the same request."""
+        path = self._path(dataset, args, kwargs)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        columns = [_encode_values(response.iloc[:, i]) for i in range(response.shape[1])]
+        index = response.index
+        default_index = isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1
+        document = {
+            "columns": response.columns.tolist(),
+            "dtypes": [kind for kind, _ in columns],
+            "data": [values for _, values in columns],
+            "index": None if default_index else _encode_values(index),
+        }
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(document, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+
+    def load(self, dataset: str, args: tuple, kwargs: dict) -> pd.DataFrame:
+        """Load a recorded response."""
+        path = self._path(dataset, args, kwargs)
+        if not path.exists():
+            raise FixtureNotFoundError(f"No recorded {dataset} response for args={args} kwargs={kwargs} in {self.root}")
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            document = json.load(f)
+        columns = [_decode_values(kind, values) for kind, values in zip(document["dtypes"], document["data"])]
+        df = pd.concat(columns, axis=1) if columns else pd.DataFrame()
+        df.columns = document["columns"]
+        if document["index"] is not None:
+            df.index = pd.Index(_decode_values(*document["index"]))
+        return df
+
+
+class RecordingProvider:
+    """Wraps another provider and records every successful response to a fixture store."""
+
+    def __init__(self, provider: DataProvider, store: FixtureStore):
+        self.provider = provider
+        self.store = store
+
+    def __getattr__(self, dataset: str):
+        if dataset not in DATASETS:
+            raise AttributeError(dataset)
+        fetch = getattr(self.provider, dataset)
+
+        def record(*args, **kwargs) -> pd.DataFrame:
+            response = fetch(*args, **kwargs)
+            if isinstance(response, pd.DataFrame):
+                self.store.save(dataset, args, kwargs, response)
+            return response
+
+        return record
+
+
+class ReplayProvider:
+    """Serves recorded responses without touching the network, after an optional injected latency."""
+
+    def __init__(self, store: FixtureStore, latency: float = 0.0):
+        """
+        :param store: Fixture store the responses were recorded to.
+        :param latency: Seconds to wait before each response, to mimic upstream round trips.
+        """
+        self.store = store
+        self.latency = latency
+
+    def __getattr__(self, dataset: str):
+        if dataset not in DATASETS:
+            raise AttributeError(dataset)
+
+        def replay(*args, **kwargs) -> pd.DataFrame:
+            if self.latency > 0:
+                time.sleep(self.latency)
+            return self.store.load(dataset, args, kwargs)
+
+        return replay
+
+
+class ThreadedAsyncProvider:
+    """Async adapter for a blocking provider: each call runs in a worker thread only for the duration of its I/O."""
+
+    def __init__(self, provider: DataProvider):
+        self.provider = provider
+
+    def __getattr__(self, dataset: str):
+        if dataset not in DATASETS:
+            raise AttributeError(dataset)
+        fetch = getattr(self.provider, dataset)
+
+        async def call(*args, **kwargs) -> pd.DataFrame:
+            return await asyncio.to_thread(fetch, *args, **kwargs)
+
+        return call
+
+
+class AsyncReplayProvider(ReplayProvider):
+    """Replay provider whose injected latency is awaited rather than slept."""
+
+    def __getattr__(self, dataset: str):
+        if dataset not in DATASETS:
+            raise AttributeError(dataset)
+
+        async def replay(*args, **kwargs) -> pd.DataFrame:
+            if self.latency > 0:
+                await asyncio.sleep(self.latency)
+            return self.store.load(dataset, args, kwargs)
+
+        return replay
+
+
+PROVIDERS = {
+    "mongo": MongoProvider,
+    "akshare": AkshareProvider,
+    "parquet": lambda: ParquetProvider(os.getenv("DATA_PARQUET_DIR", DEFAULT_PARQUET_DIR)),
+}
+
+
+def _fixture_store() -> FixtureStore:
+    return FixtureStore(os.getenv("DATA_FIXTURE_DIR", DEFAULT_FIXTURE_DIR))
+
+
+def _replay_latency() -> float:
+    return float(os.getenv("DATA_REPLAY_LATENCY_MS", "0")) / 1000
+
+
+def _create_provider() -> DataProvider:
+    name = os.getenv("DATA_PROVIDER", "mongo").lower()
+    if name == "replay":
+        return ReplayProvider(_fixture_store(), latency=_replay_latency())
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown DATA_PROVIDER: {name} (expected one of {', '.join([*PROVIDERS, 'replay'])})")
+    provider = PROVIDERS[name]()
+    if _recording():
+        provider = RecordingProvider(provider, _fixture_store())
+    return provider
+
+
+def _recording() -> bool:
+    return os.getenv("DATA_RECORD_FIXTURES", "false").lower() == "true"
+
+
+# Global providers, selected by DATA_PROVIDER
+_provider = _create_provider()
+_async_provider = AsyncReplayProvider(_provider.store, _provider.latency) if isinstance(_provider, ReplayProvider) else ThreadedAsyncProvider(_provider)
+
+
+def get_provider() -> DataProvider:
+    """Get the global data provider."""
+    return _provider
+
+
+def get_async_provider() -> AsyncDataProvider:
+    """Get the global async data provider, backed by the same source as get_provider()."""
+    return _async_provider
+
+
+def get_fixture_dir() -> Path | None:
+    """Get the fixture directory when recording or replaying fixtures, else None."""
+    return _provider.store.root if isinstance(_provider, (RecordingProvider, ReplayProvider)) else None
@@ -0,0 +1,95 @@
+import json
+import os
+import random
+import threading
+import time
+from typing import Callable
+
+import requests
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Default sustained request rate (per second) and burst size for each upstream endpoint; a rate of 0 disables throttling
+DEFAULT_RATE = float(os.getenv("AKSHARE_RATE_LIMIT", "5"))
+DEFAULT_BURST = int(os.getenv("AKSHARE_BURST", "5"))
+# Per-endpoint rate overrides, e.g. "stock_news_em=1,stock_zh_a_hist=10"
+RATE_OVERRIDES = {
+    endpoint.strip(): float(rate)
+    for endpoint, _, rate in (item.partition("=") for item in os.getenv("AKSHARE_RATE_LIMITS", "").split(","))
+    if endpoint.strip() and rate
+}
+# Retries after the first attempt, and the base/cap in seconds of the jittered exponential backoff between them
+MAX_RETRIES = int(os.getenv("AKSHARE_MAX_RETRIES", "3"))
+BACKOFF_BASE = float(os.getenv("AKSHARE_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX = float(os.getenv("AKSHARE_BACKOFF_MAX", "8"))
+
+
+class TokenBucket:
+    """Thread-safe token bucket: allows `burst` calls at once and `rate` calls per second sustained."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(endpoint: str) -> TokenBucket:
+    """Get the process-wide token bucket for an upstream endpoint, creating it on first use."""
+    with _buckets_lock:
+        if endpoint not in _buckets:
+            _buckets[endpoint] = TokenBucket(RATE_OVERRIDES.get(endpoint, DEFAULT_RATE), DEFAULT_BURST)
+        return _buckets[endpoint]
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether an upstream failure is transient (throttling, network, server-side) and worth retrying."""
+    if isinstance(error, requests.HTTPError):
+        status = error.response.status_code if error.response is not None else None
+        return status is None or status == 429 or status >= 500
+    # Throttled endpoints tend to answer with an HTML error page, which surfaces as a JSON decode error
+    return isinstance(error, (requests.ConnectionError, requests.Timeout, json.JSONDecodeError, ConnectionError, TimeoutError))
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff: a random delay up to base * 2^attempt, capped."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+
+
+def call_with_retry(endpoint: str, fn: Callable, *args, max_retries: int | None = None, **kwargs):
+    """
+    Call fn(*args, **kwargs) through the endpoint's rate limiter, retrying transient failures with backoff.
+
+    Non-retryable errors, and the last transient one once retries run out, are raised unchanged.
+    """
+    max_retries = MAX_RETRIES if max_retries is None else max_retries
+    bucket = get_bucket(endpoint)
+    for attempt in range(max_retries + 1):
+        bucket.acquire()
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if attempt == max_retries or not is_retryable(e):
+                raise
+        time.sleep(backoff_delay(attempt))
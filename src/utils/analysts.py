@@ -14,78 +14,201 @@ from src.agents.stanley_druckenmiller import stanley_druckenmiller_agent
 from src.agents.technicals import technical_analyst_agent
 from src.agents.valuation import valuation_agent
 from src.agents.warren_buffett import warren_buffett_agent
+from src.data.requirements import WINDOW
 
 # Define analyst configuration - single source of truth
+# data_requirements declares the data each analyst reads per ticker, see src/data/requirements.py
 ANALYST_CONFIG = {
     "aswath_damodaran": {
         "display_name": "Aswath Damodaran",
         "agent_func": aswath_damodaran_agent,
         "order": 0,
+        "data_requirements": {
+            "financial_metrics": {"period": "ttm", "limit": 5},
+            "line_items": {
+                "fields": ["free_cash_flow", "ebit", "interest_expense", "capital_expenditure", "depreciation_and_amortization", "outstanding_shares", "net_income", "total_debt"],
+                "period": "ttm",
+                "limit": 10,
+            },
+            "market_cap": {},
+        },
     },
     "ben_graham": {
         "display_name": "Ben Graham",
         "agent_func": ben_graham_agent,
         "order": 1,
+        "data_requirements": {
+            "financial_metrics": {"period": "annual", "limit": 10},
+            "line_items": {
+                "fields": ["earnings_per_share", "revenue", "net_income", "book_value_per_share", "total_assets", "total_liabilities", "current_assets", "current_liabilities", "dividends_and_other_cash_distributions", "outstanding_shares"],
+                "period": "annual",
+                "limit": 10,
+            },
+            "market_cap": {},
+        },
     },
     "bill_ackman": {
         "display_name": "Bill Ackman",
         "agent_func": bill_ackman_agent,
         "order": 2,
+        "data_requirements": {
+            "financial_metrics": {"period": "annual", "limit": 5},
+            "line_items": {
+                "fields": ["revenue", "operating_margin", "debt_to_equity", "free_cash_flow", "total_assets", "total_liabilities", "dividends_and_other_cash_distributions", "outstanding_shares"],
+                "period": "annual",
+                "limit": 5,
+            },
+            "market_cap": {},
+        },
     },
     "cathie_wood": {
         "display_name": "Cathie Wood",
         "agent_func": cathie_wood_agent,
         "order": 3,
+        "data_requirements": {
+            "financial_metrics": {"period": "annual", "limit": 5},
+            "line_items": {
+                "fields": ["revenue", "gross_margin", "operating_margin", "debt_to_equity", "free_cash_flow", "total_assets", "total_liabilities", "dividends_and_other_cash_distributions", "outstanding_shares", "research_and_development", "capital_expenditure", "operating_expense"],
+                "period": "annual",
+                "limit": 5,
+            },
+            "market_cap": {},
+        },
     },
     "charlie_munger": {
         "display_name": "Charlie Munger",
         "agent_func": charlie_munger_agent,
         "order": 4,
+        "data_requirements": {
+            "financial_metrics": {"period": "annual", "limit": 10},
+            "line_items": {
+                "fields": ["revenue", "net_income", "operating_income", "return_on_invested_capital", "gross_margin", "operating_margin", "free_cash_flow", "capital_expenditure", "cash_and_equivalents", "total_debt", "shareholders_equity", "outstanding_shares", "research_and_development", "goodwill_and_intangible_assets"],
+                "period": "annual",
+                "limit": 10,
+            },
+            "market_cap": {},
+            "insider_trades": {"start": None, "limit": 100},
+            "company_news": {"start": None, "limit": 100},
+        },
     },
     "michael_burry": {
         "display_name": "Michael Burry",
         "agent_func": michael_burry_agent,
         "order": 5,
+        "data_requirements": {
+            "financial_metrics": {"period": "ttm", "limit": 5},
+            "line_items": {
+                "fields": ["free_cash_flow", "net_income", "total_debt", "cash_and_equivalents", "total_assets", "total_liabilities", "outstanding_shares", "issuance_or_purchase_of_equity_shares"],
+                "period": "ttm",
+                "limit": 10,
+            },
+            "market_cap": {},
+            "insider_trades": {"start": 365, "limit": 1000},
+            "company_news": {"start": 365, "limit": 250},
+        },
     },
     "peter_lynch": {
         "display_name": "Peter Lynch",
         "agent_func": peter_lynch_agent,
         "order": 6,
+        "data_requirements": {
+            "prices": {"start": WINDOW},
+            "financial_metrics": {"period": "annual", "limit": 5},
+            "line_items": {
+                "fields": ["revenue", "earnings_per_share", "net_income", "operating_income", "gross_margin", "operating_margin", "free_cash_flow", "capital_expenditure", "cash_and_equivalents", "total_debt", "shareholders_equity", "outstanding_shares"],
+                "period": "annual",
+                "limit": 5,
+            },
+            "market_cap": {},
+            "insider_trades": {"start": None, "limit": 50},
+            "company_news": {"start": None, "limit": 50},
+        },
     },
     "phil_fisher": {
         "display_name": "Phil Fisher",
         "agent_func": phil_fisher_agent,
         "order": 7,
+        "data_requirements": {
+            "financial_metrics": {"period": "annual", "limit": 5},
+            "line_items": {
+                "fields": ["revenue", "net_income", "earnings_per_share", "free_cash_flow", "research_and_development", "operating_income", "operating_margin", "gross_margin", "total_debt", "shareholders_equity", "cash_and_equivalents", "ebit", "ebitda"],
+                "period": "annual",
+                "limit": 5,
+            },
+            "market_cap": {},
+            "insider_trades": {"start": None, "limit": 50},
+            "company_news": {"start": None, "limit": 50},
+        },
     },
     "stanley_druckenmiller": {
         "display_name": "Stanley Druckenmiller",
         "agent_func": stanley_druckenmiller_agent,
         "order": 8,
+        "data_requirements": {
+            "prices": {"start": WINDOW},
+            "financial_metrics": {"period": "annual", "limit": 5},
+            "line_items": {
+                "fields": ["revenue", "earnings_per_share", "net_income", "operating_income", "gross_margin", "operating_margin", "free_cash_flow", "capital_expenditure", "cash_and_equivalents", "total_debt", "shareholders_equity", "outstanding_shares", "ebit", "ebitda"],
+                "period": "annual",
+                "limit": 5,
+            },
+            "market_cap": {},
+            "insider_trades": {"start": None, "limit": 50},
+            "company_news": {"start": None, "limit": 50},
+        },
     },
     "warren_buffett": {
         "display_name": "Warren Buffett",
         "agent_func": warren_buffett_agent,
         "order": 9,
+        "data_requirements": {
+            "financial_metrics": {"period": "ttm", "limit": 5},
+            "line_items": {
+                "fields": ["capital_expenditure", "depreciation_and_amortization", "net_income", "outstanding_shares", "total_assets", "total_liabilities", "dividends_and_other_cash_distributions", "issuance_or_purchase_of_equity_shares"],
+                "period": "ttm",
+                "limit": 10,
+            },
+            "market_cap": {},
+        },
     },
     "technical_analyst": {
         "display_name": "Technical Analyst",
         "agent_func": technical_analyst_agent,
         "order": 10,
+        "data_requirements": {
+            "prices": {"start": WINDOW},
+        },
     },
     "fundamentals_analyst": {
         "display_name": "Fundamentals Analyst",
         "agent_func": fundamentals_agent,
         "order": 11,
+        "data_requirements": {
+            "financial_metrics": {"period": "ttm", "limit": 10},
+        },
     },
     "sentiment_analyst": {
         "display_name": "Sentiment Analyst",
         "agent_func": sentiment_agent,
         "order": 12,
+        "data_requirements": {
+            "insider_trades": {"start": None, "limit": 1000},
+            "company_news": {"start": None, "limit": 100},
+        },
     },
     "valuation_analyst": {
         "display_name": "Valuation Analyst",
         "agent_func": valuation_agent,
         "order": 13,
+        "data_requirements": {
+            "financial_metrics": {"period": "ttm", "limit": 8},
+            "line_items": {
+                "fields": ["free_cash_flow", "net_income", "depreciation_and_amortization", "capital_expenditure", "working_capital"],
+                "period": "ttm",
+                "limit": 2,
+            },
+            "market_cap": {},
+        },
     },
 }
 
@@ -96,3 +219,9 @@ ANALYST_ORDER = [(config["display_name"], key) for key, config in sorted(ANALYST
 def get_analyst_nodes():
     """Get the mapping of analyst keys to their (node_name, agent_func) tuples."""
     return {key: (f"{key}_agent", config["agent_func"]) for key, config in ANALYST_CONFIG.items()}
+
+
+def get_data_requirements(selected_analysts: list[str] | None = None) -> list[dict]:
+    """Get the data requirements of the selected analysts, or of every analyst if none are given."""
+    keys = ANALYST_CONFIG if selected_analysts is None else [key for key in selected_analysts if key in ANALYST_CONFIG]
+    return [ANALYST_CONFIG[key]["data_requirements"] for key in keys]
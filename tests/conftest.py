@@ -0,0 +1,79 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+class FakeProvider:
+    """DataProvider returning small akshare-shaped frames and counting the calls made to it."""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _record(self, *call):
+        with self._lock:
+            self.calls.append(call)
+
+    def count(self, dataset: str) -> int:
+        return sum(1 for call in self.calls if call[0] == dataset)
+
+    def prices(self, ticker, start_date, end_date):
+        self._record("prices", ticker, start_date, end_date)
+        dates = pd.bdate_range(start_date, end_date)
+        values = np.arange(len(dates), dtype="f8")
+        return pd.DataFrame({"日期": dates.date, "开盘": values + 1, "收盘": values + 2, "最高": values + 3, "最低": values, "成交量": values * 100})
+
+    def valuation(self, ticker):
+        self._record("valuation", ticker)
+        dates = pd.bdate_range("2023-01-02", "2024-12-31")
+        values = np.arange(len(dates), dtype="f8")
+        return pd.DataFrame({"数据日期": dates.strftime("%Y-%m-%d"), "总市值": values * 1e6 + 1e9, "流通市值": values * 1e5 + 5e8, "PE(TTM)": 10.0, "市净率": 1.5, "市销率": 2.0})
+
+    def financial_indicators(self, ticker):
+        self._record("financial_indicators", ticker)
+        periods = ["2023-03-31", "2023-06-30", "2023-09-30", "2023-12-31", "2024-03-31", "2024-06-30"]
+        return pd.DataFrame({"日期": pd.to_datetime(periods).date, "每股收益_调整后(元)": np.linspace(0.1, 0.6, len(periods)), "资产负债率(%)": 50.0})
+
+    def financial_report(self, ticker, statement):
+        self._record("financial_report", ticker, statement)
+        return pd.DataFrame({"报告日": ["20240630", "20231231"], "营业收入": [2e9, 3e9], "净利润": [2e8, 3e8], "基本每股收益": [0.2, 0.3], "公告日期": ["2024-08-28", "2024-03-29"]})
+
+    def insider_trades(self, ticker, start_date, end_date, limit):
+        self._record("insider_trades", ticker, start_date, end_date, limit)
+        dates = pd.bdate_range("2024-01-02", periods=20)
+        df = pd.DataFrame({"日期": dates.date, "代码": ticker, "名称": "x", "变动人": [f"p{i}" for i in range(len(dates))], "变动股数": 100.0, "成交均价": 1.0, "变动金额": 100.0, "变动后持股数": 1000.0, "持股种类": "A股", "职务": "董事", "变动人与董监高的关系": "本人"})
+        df = df[df["日期"].astype(str) <= end_date]
+        if start_date:
+            df = df[df["日期"].astype(str) >= start_date]
+        return df.iloc[::-1].head(limit).reset_index(drop=True)
+
+    def company_news(self, ticker):
+        self._record("company_news", ticker)
+        dates = pd.date_range("2024-06-01 09:30", periods=30, freq="D")
+        return pd.DataFrame({"关键词": ticker, "新闻标题": [f"t{i}" for i in range(len(dates))], "新闻内容": "c", "发布时间": dates.strftime("%Y-%m-%d %H:%M:%S"), "文章来源": "s", "新闻链接": [f"u{i}" for i in range(len(dates))]})
+
+
+@pytest.fixture
+def provider() -> FakeProvider:
+    return FakeProvider()
+
+
+@pytest.fixture
+def api(monkeypatch, tmp_path, provider):
+    """src.tools.api with an empty cache, a temporary price store and the fake provider behind both the sync and the
+    async functions."""
+    pytest.importorskip("akshare")
+    pytest.importorskip("pymongo")
+    from src.data.cache import Cache
+    from src.data.price_store import PriceStore
+    from src.tools import api
+    from src.tools.providers import ThreadedAsyncProvider
+
+    monkeypatch.setattr(api, "_provider", provider)
+    monkeypatch.setattr(api, "_async_provider", ThreadedAsyncProvider(provider))
+    monkeypatch.setattr(api, "_cache", Cache())
+    monkeypatch.setattr(api, "_price_store", PriceStore(str(tmp_path / "prices")))
+    monkeypatch.setattr(api, "_fixture_dir", None)
+    return api
@@ -0,0 +1,42 @@
+import numpy as np
+
+from src.data.arrays import PRICE_DTYPE, merge_by_key
+
+
+def _bars(days: list[str], close: float) -> np.ndarray:
+    data = np.zeros(len(days), dtype=PRICE_DTYPE)
+    data["time"] = np.array(days, dtype="datetime64[D]")
+    data["close"] = close
+    return data
+
+
+def test_overlapping_rows_are_replaced_and_kept_sorted():
+    existing = _bars(["2024-01-01", "2024-01-02", "2024-01-03"], 1.0)
+    new = _bars(["2024-01-04", "2024-01-02", "2023-12-29"], 2.0)
+
+    [merged] = merge_by_key("time", (existing,), (new,))
+
+    assert merged["time"].astype(str).tolist() == ["2023-12-29", "2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"]
+    assert merged["close"].tolist() == [2.0, 1.0, 2.0, 1.0, 2.0]
+
+
+def test_parallel_arrays_follow_their_rows():
+    existing = _bars(["2024-01-01", "2024-01-02"], 1.0)
+    published = np.array(["2024-02-01", "2024-02-02"], dtype="datetime64[D]")
+    new = _bars(["2024-01-02"], 2.0)
+
+    merged, merged_published = merge_by_key("time", (existing, published), (new, np.array(["2024-03-02"], dtype="datetime64[D]")))
+
+    assert merged["close"].tolist() == [1.0, 2.0]
+    assert merged_published.astype(str).tolist() == ["2024-02-01", "2024-03-02"]
+
+
+def test_later_rows_are_appended():
+    existing = _bars(["2024-01-01", "2024-01-02"], 1.0)
+    new = _bars(["2024-01-03", "2024-01-04"], 2.0)
+
+    [merged] = merge_by_key("time", (existing,), (new,))
+
+    assert merged["time"].astype(str).tolist() == ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"]
+    assert merged["close"].tolist() == [1.0, 1.0, 2.0, 2.0]
+    assert merge_by_key("time", (existing,), (new[:0],))[0] is existing
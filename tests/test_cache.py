@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+from src.data.arrays import PRICE_DTYPE
+from src.data.cache import Cache
+
+
+def _bars(start: str, days: int, close: float = 1.0) -> np.ndarray:
+    data = np.zeros(days, dtype=PRICE_DTYPE)
+    data["time"] = np.datetime64(start) + np.arange(days)
+    data["close"] = close + np.arange(days)
+    data["volume"] = 100
+    return data
+
+
+def _rebuilt_frame(cache: Cache, ticker: str) -> pd.DataFrame:
+    fresh = Cache()
+    fresh.set_prices(ticker, cache.get_price_array(ticker, "1900-01-01", "2100-01-01"))
+    return fresh.get_price_frame(ticker, "1900-01-01", "2100-01-01")
+
+
+def test_appends_reuse_spare_capacity():
+    cache = Cache()
+    cache.set_prices("AAA", _bars("2024-01-01", 1))
+    series = cache._prices_cache.get("AAA")
+    buffers = {id(series._buffer)}
+    for day in range(1, 1000):
+        cache.set_prices("AAA", _bars(str(np.datetime64("2024-01-01") + day), 1, close=day))
+        buffers.add(id(series._buffer))
+
+    assert len(series) == 1000
+    # Capacity doubles, so 1000 single-bar appends reallocate about log2(1000) times rather than on every write
+    assert len(buffers) <= 12
+    data = cache.get_price_array("AAA", "2024-01-01", "2030-01-01")
+    assert np.all(data["time"][1:] > data["time"][:-1])
+    assert data["close"][-1] == 999
+
+
+def test_slices_handed_out_are_read_only_and_stable():
+    cache = Cache()
+    cache.set_prices("AAA", _bars("2024-01-01", 10))
+    first = cache.get_price_array("AAA", "2024-01-01", "2024-01-10")
+    assert not first.flags.writeable
+    cache.set_prices("AAA", _bars("2024-01-11", 5, close=50))
+    cache.set_prices("AAA", _bars("2024-01-03", 1, close=-1))
+    assert first["close"].tolist() == [float(i + 1) for i in range(10)]
+    assert cache.get_price_array("AAA", "2024-01-03", "2024-01-03")["close"].tolist() == [-1.0]
+
+
+def test_price_frame_is_extended_by_appends():
+    cache = Cache()
+    cache.set_prices("AAA", _bars("2024-01-01", 10))
+    before = cache.get_price_frame("AAA", "2024-01-01", "2024-12-31")
+    columns = cache._price_columns["AAA"]
+
+    cache.set_prices("AAA", _bars("2024-01-11", 5, close=50))
+    assert cache._price_columns["AAA"] is columns
+    frame = cache.get_price_frame("AAA", "2024-01-01", "2024-12-31")
+    assert len(before) == 10
+    assert len(frame) == 15
+    pd.testing.assert_frame_equal(frame, _rebuilt_frame(cache, "AAA"))
+
+
+def test_price_frame_is_rebuilt_after_an_out_of_order_write():
+    cache = Cache()
+    cache.set_prices("AAA", _bars("2024-01-01", 10))
+    cache.get_price_frame("AAA", "2024-01-01", "2024-12-31")
+
+    cache.set_prices("AAA", _bars("2024-01-05", 2, close=-1))
+    assert "AAA" not in cache._price_columns
+    frame = cache.get_price_frame("AAA", "2024-01-01", "2024-12-31")
+    assert frame.loc["2024-01-05":"2024-01-06", "close"].tolist() == [-1.0, 0.0]
+    pd.testing.assert_frame_equal(frame, _rebuilt_frame(cache, "AAA"))
+
+
+def test_least_recently_used_tickers_are_evicted_over_budget():
+    sizing = Cache()
+    sizing.set_prices("AAA", _bars("2024-01-01", 100))
+    entry_bytes = sizing.stats()["prices"]["resident_bytes"]
+
+    cache = Cache(max_bytes_per_dataset=int(entry_bytes * 2.5))
+    cache.set_prices("AAA", _bars("2024-01-01", 100))
+    cache.set_prices("BBB", _bars("2024-01-01", 100))
+    # Reading AAA makes BBB the least recently used entry
+    cache.get_price_array("AAA", "2024-01-01", "2024-01-31")
+    cache.set_prices("CCC", _bars("2024-01-01", 100))
+
+    assert cache.has_prices("AAA") and cache.has_prices("CCC")
+    assert not cache.has_prices("BBB")
+    stats = cache.stats()["prices"]
+    assert stats["evictions"] == 1
+    assert stats["resident_bytes"] <= entry_bytes * 2.5
+
+
+def test_eviction_drops_coverage_and_the_price_frame():
+    sizing = Cache()
+    sizing.set_prices("AAA", _bars("2024-01-01", 100))
+    sizing.get_price_frame("AAA", "2024-01-01", "2024-12-31")
+    entry_bytes = sizing.stats()["prices"]["resident_bytes"]
+
+    cache = Cache(max_bytes_per_dataset=int(entry_bytes * 1.5))
+    cache.set_prices("AAA", _bars("2024-01-01", 100))
+    cache.add_price_coverage("AAA", "2024-01-01", "2024-04-09")
+    cache.get_price_frame("AAA", "2024-01-01", "2024-12-31")
+    cache.set_prices("BBB", _bars("2024-01-01", 100))
+    cache.get_price_frame("BBB", "2024-01-01", "2024-12-31")
+
+    assert not cache.has_prices("AAA")
+    # Coverage left behind would make get_prices treat the range as cached and return nothing
+    assert cache.get_price_coverage("AAA") == []
+    assert cache.missing_price_ranges("AAA", "2024-01-01", "2024-04-09") == [("2024-01-01", "2024-04-09")]
+    assert "AAA" not in cache._price_columns
+    assert cache.get_price_frame("AAA", "2024-01-01", "2024-12-31") is None
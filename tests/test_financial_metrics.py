@@ -0,0 +1,57 @@
+import asyncio
+
+import pandas as pd
+
+
+def _periods(metrics) -> list[str]:
+    return [m.report_period for m in metrics]
+
+
+def test_metrics_are_public_from_their_announcement_date(api):
+    # The annual report for 2023 was announced on 2024-03-29, a month before its deadline; the Q1 report has no
+    # announcement date in the statement, so it stays hidden until its deadline of 2024-04-30
+    assert _periods(api.get_financial_metrics("600000", "2024-03-28")) == ["2023-09-30", "2023-06-30", "2023-03-31"]
+    assert _periods(api.get_financial_metrics("600000", "2024-03-29"))[0] == "2023-12-31"
+    assert _periods(api.get_financial_metrics("600000", "2024-04-29"))[0] == "2023-12-31"
+    assert _periods(api.get_financial_metrics("600000", "2024-04-30"))[0] == "2024-03-31"
+    assert _periods(api.get_financial_metrics("600000", "2024-08-27"))[0] == "2024-03-31"
+    assert _periods(api.get_financial_metrics("600000", "2024-08-28"))[0] == "2024-06-30"
+
+
+def test_async_metrics_share_the_statement_fetch(api, provider):
+    async def run():
+        return await asyncio.gather(api.aget_financial_metrics("600000", "2024-03-29"), api.asearch_line_items("600000", ["revenue"], "2024-03-29"))
+
+    metrics, line_items = asyncio.run(run())
+    assert _periods(metrics)[0] == "2023-12-31"
+    assert [item.report_period for item in line_items] == ["2023-12-31"]
+    assert provider.count("financial_report") == 1
+
+
+def test_metrics_fall_back_to_deadlines_without_a_statement(api, provider, monkeypatch):
+    def fail(ticker, statement):
+        raise ConnectionError("statement unavailable")
+
+    monkeypatch.setattr(provider, "financial_report", fail)
+    assert _periods(api.get_financial_metrics("600000", "2024-04-29"))[0] == "2023-09-30"
+    assert _periods(api.get_financial_metrics("600000", "2024-04-30"))[0] == "2024-03-31"
+
+
+def test_metrics_take_the_last_valuation_on_or_before_the_report_date(api):
+    indicators = pd.DataFrame({"日期": ["2022-12-31", "2023-09-30", "2023-12-31"], "每股收益_调整后(元)": [0.1, 0.2, 0.3]})
+    # 2023-09-30 and 2023-12-31 fall on weekends without a valuation row; the 2022 report predates the series
+    valuations = api._prepare_valuation_series(pd.DataFrame({
+        "数据日期": ["2023-09-28", "2023-09-29", "2023-10-09", "2023-12-29", "2024-01-02"],
+        "总市值": [1e9, 2e9, 3e9, 4e9, 5e9],
+        "PE(TTM)": [10.0, 11.0, 12.0, 13.0, 14.0],
+        "市净率": 1.5,
+        "市销率": 2.0,
+    }))
+
+    metrics, _ = api._build_financial_metrics("600000", indicators, valuations, "ttm")
+
+    by_period = {m.report_period: m for m in metrics}
+    assert _periods(metrics) == ["2023-12-31", "2023-09-30", "2022-12-31"]
+    assert (by_period["2023-12-31"].market_cap, by_period["2023-12-31"].price_to_earnings_ratio) == (4e9, 13.0)
+    assert (by_period["2023-09-30"].market_cap, by_period["2023-09-30"].enterprise_value) == (2e9, 2e9)
+    assert by_period["2022-12-31"].market_cap is None
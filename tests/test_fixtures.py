@@ -0,0 +1,52 @@
+import gzip
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("akshare")
+pytest.importorskip("pymongo")
+
+from src.tools.providers import FixtureNotFoundError, FixtureStore, RecordingProvider, ReplayProvider  # noqa: E402
+
+
+def test_replay_serves_recorded_responses_without_the_provider(tmp_path, provider):
+    store = FixtureStore(tmp_path)
+    recording = RecordingProvider(provider, store)
+    recorded = {
+        "prices": recording.prices("600519", "2024-01-02", "2024-01-31"),
+        "valuation": recording.valuation("600519"),
+        "financial_indicators": recording.financial_indicators("600519"),
+        "insider_trades": recording.insider_trades("600519", None, "2024-12-31", 5),
+        "company_news": recording.company_news("600519"),
+    }
+    calls = len(provider.calls)
+
+    replay = ReplayProvider(store)
+    pd.testing.assert_frame_equal(replay.prices("600519", "2024-01-02", "2024-01-31"), recorded["prices"])
+    pd.testing.assert_frame_equal(replay.valuation("600519"), recorded["valuation"])
+    pd.testing.assert_frame_equal(replay.financial_indicators("600519"), recorded["financial_indicators"])
+    pd.testing.assert_frame_equal(replay.insider_trades("600519", None, "2024-12-31", 5), recorded["insider_trades"])
+    pd.testing.assert_frame_equal(replay.company_news("600519"), recorded["company_news"])
+    assert len(provider.calls) == calls
+    with pytest.raises(FixtureNotFoundError):
+        replay.prices("600519", "2024-02-01", "2024-02-29")
+
+
+def test_fixtures_round_trip_dtypes_as_json(tmp_path):
+    df = pd.DataFrame({
+        "日期": pd.to_datetime(["2024-01-02", None]).date,
+        "时间": pd.to_datetime(["2024-01-02 09:30:00.123456", None]),
+        "带时区": pd.to_datetime(["2024-01-02 09:30", "2024-01-03 09:30"]).tz_localize("Asia/Shanghai"),
+        "收盘": [0.1 + 0.2, float("nan")],
+        "成交量": [1, 2],
+        "名称": ["贵州茅台", None],
+        "停牌": [False, True],
+    }, index=pd.Index([3, 7]))
+    store = FixtureStore(tmp_path)
+    store.save("prices", ("600519",), {}, df)
+
+    pd.testing.assert_frame_equal(store.load("prices", ("600519",), {}), df)
+    [path] = (tmp_path / "prices").iterdir()
+    assert path.name.endswith(".json.gz")
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        assert "贵州茅台" in f.read()
@@ -0,0 +1,45 @@
+import numpy as np
+
+from src.data.fundamentals import PointInTimeSeries, publication_deadline, records_to_array
+
+
+def _dates(values) -> list[str]:
+    return np.datetime_as_string(values, unit="D").tolist()
+
+
+def test_publication_deadline_per_quarter():
+    deadlines = publication_deadline(["2024-03-31", "2024-06-30", "2024-09-30", "2024-12-31"])
+    assert _dates(deadlines) == ["2024-04-30", "2024-08-31", "2024-10-31", "2025-04-30"]
+
+
+def test_publication_deadline_leap_year_and_missing():
+    deadlines = publication_deadline(["2023-12-31", None])
+    assert _dates(deadlines[:1]) == ["2024-04-30"]
+    assert np.isnat(deadlines[1])
+
+
+def _series() -> PointInTimeSeries:
+    records = [{"report_period": period, "value": value} for period, value in [("2023-12-31", 1.0), ("2024-03-31", 2.0), ("2024-06-30", 3.0)]]
+    # The annual report comes out after the Q1 report
+    published = np.array(["2024-04-25", "2024-04-20", "2024-08-28"], dtype="datetime64[D]")
+    return PointInTimeSeries("report_period", records_to_array(records, "report_period"), published)
+
+
+def test_as_of_hides_unpublished_reports():
+    series = _series()
+    assert series.as_of("2024-04-19", 10)["report_period"].tolist() == []
+    assert series.as_of("2024-04-20", 10)["report_period"].tolist() == ["2024-03-31"]
+    assert series.as_of("2024-04-25", 10)["report_period"].tolist() == ["2024-03-31", "2023-12-31"]
+    assert series.as_of("2024-12-31", 10)["report_period"].tolist() == ["2024-06-30", "2024-03-31", "2023-12-31"]
+
+
+def test_as_of_limit_keeps_newest_periods():
+    assert _series().as_of("2024-12-31", 2)["report_period"].tolist() == ["2024-06-30", "2024-03-31"]
+
+
+def test_merge_replaces_same_period_and_republishes():
+    series = _series()
+    series.merge(records_to_array([{"report_period": "2024-03-31", "value": 5.0}], "report_period"), np.array(["2024-05-10"], dtype="datetime64[D]"))
+    assert len(series) == 3
+    assert series.as_of("2024-04-25", 10)["report_period"].tolist() == ["2023-12-31"]
+    assert series.as_of("2024-05-10", 1)["value"].tolist() == [5.0]
@@ -0,0 +1,47 @@
+from src.data.cache import _add_interval, _missing_intervals
+
+
+def test_add_interval_merges_adjacent_days():
+    assert _add_interval([("2024-01-01", "2024-01-10")], "2024-01-11", "2024-01-20") == [("2024-01-01", "2024-01-20")]
+
+
+def test_add_interval_merges_across_month_end():
+    assert _add_interval([("2024-02-20", "2024-02-29")], "2024-03-01", "2024-03-05") == [("2024-02-20", "2024-03-05")]
+
+
+def test_add_interval_keeps_one_day_gap():
+    assert _add_interval([("2024-01-01", "2024-01-10")], "2024-01-12", "2024-01-20") == [("2024-01-01", "2024-01-10"), ("2024-01-12", "2024-01-20")]
+
+
+def test_add_interval_merges_overlaps_and_contained():
+    intervals = _add_interval([("2024-01-01", "2024-01-05"), ("2024-01-08", "2024-01-12")], "2024-01-04", "2024-01-09")
+    assert intervals == [("2024-01-01", "2024-01-12")]
+    assert _add_interval(intervals, "2024-01-02", "2024-01-03") == intervals
+
+
+def test_missing_intervals_without_coverage():
+    assert _missing_intervals([], "2024-01-01", "2024-01-31") == [("2024-01-01", "2024-01-31")]
+
+
+def test_missing_intervals_fully_covered():
+    assert _missing_intervals([("2024-01-01", "2024-01-31")], "2024-01-05", "2024-01-20") == []
+
+
+def test_missing_intervals_gap_boundaries():
+    intervals = [("2024-01-05", "2024-01-10"), ("2024-01-15", "2024-01-20")]
+    assert _missing_intervals(intervals, "2024-01-01", "2024-01-31") == [
+        ("2024-01-01", "2024-01-04"),
+        ("2024-01-11", "2024-01-14"),
+        ("2024-01-21", "2024-01-31"),
+    ]
+
+
+def test_missing_intervals_range_ends_on_covered_edge():
+    intervals = [("2024-01-05", "2024-01-10")]
+    assert _missing_intervals(intervals, "2024-01-10", "2024-01-12") == [("2024-01-11", "2024-01-12")]
+    assert _missing_intervals(intervals, "2024-01-01", "2024-01-05") == [("2024-01-01", "2024-01-04")]
+    assert _missing_intervals(intervals, "2024-01-11", "2024-01-11") == [("2024-01-11", "2024-01-11")]
+
+
+def test_missing_intervals_empty_range():
+    assert _missing_intervals([], "2024-01-02", "2024-01-01") == []
@@ -0,0 +1,60 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.data.arrays import PRICE_DTYPE
+from src.data.price_store import PriceStore
+
+
+def _bars(start: str, days: int, close: float = 1.0) -> np.ndarray:
+    data = np.zeros(days, dtype=PRICE_DTYPE)
+    data["time"] = np.datetime64(start) + np.arange(days)
+    data["close"] = close
+    return data
+
+
+def test_round_trip(tmp_path):
+    store = PriceStore(str(tmp_path))
+    assert store.read("AAA") == (None, [])
+
+    store.append("AAA", _bars("2024-01-01", 10), [("2024-01-01", "2024-01-10")])
+    store.append("AAA", _bars("2024-01-08", 5, close=2.0), [("2024-01-08", "2024-01-12")])
+
+    data, coverage = PriceStore(str(tmp_path)).read("AAA")
+    assert len(data) == 12
+    assert np.datetime_as_string(data["time"][[0, -1]]).tolist() == ["2024-01-01", "2024-01-12"]
+    # Newer rows win on overlapping dates
+    assert data["close"][6:].tolist() == [1.0] + [2.0] * 5
+    assert coverage == [("2024-01-01", "2024-01-12")]
+
+
+def test_coverage_merges_with_stored_intervals(tmp_path):
+    PriceStore(str(tmp_path)).append("AAA", _bars("2024-01-01", 3), [("2024-01-01", "2024-01-03")])
+    # Another store instance, as in another process, with no memory of the first interval
+    PriceStore(str(tmp_path)).append("AAA", _bars("2024-02-01", 3), [("2024-02-01", "2024-02-03")])
+    _, coverage = PriceStore(str(tmp_path)).read("AAA")
+    assert coverage == [("2024-01-01", "2024-01-03"), ("2024-02-01", "2024-02-03")]
+
+
+def test_coverage_without_rows(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.append("AAA", _bars("2024-01-01", 3), [("2024-01-01", "2024-01-03")])
+    # A range with no trading days still counts as fetched
+    store.append("AAA", _bars("2024-01-04", 0), [("2024-01-04", "2024-01-07")])
+    assert store.read("AAA")[1] == [("2024-01-01", "2024-01-07")]
+
+
+def _append_month(root: str, month: int):
+    start = f"2024-{month:02d}-01"
+    PriceStore(root).append("AAA", _bars(start, 28, close=float(month)), [(start, f"2024-{month:02d}-28")])
+
+
+def test_concurrent_processes_keep_every_row(tmp_path):
+    months = range(1, 13)
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        list(pool.map(_append_month, [str(tmp_path)] * len(months), months))
+
+    data, coverage = PriceStore(str(tmp_path)).read("AAA")
+    assert len(data) == 28 * len(months)
+    assert sorted(set(data["close"].tolist())) == [float(month) for month in months]
+    assert len(coverage) == len(months)
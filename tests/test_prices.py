@@ -0,0 +1,31 @@
+from src.data.cache import Cache
+
+
+def _price_requests(provider) -> list[tuple[str, str]]:
+    return [(start_date, end_date) for dataset, _, start_date, end_date in provider.calls if dataset == "prices"]
+
+
+def test_only_missing_ranges_are_fetched(api, provider):
+    january = api.get_prices("600519", "2024-01-01", "2024-01-31")
+    api.get_prices("600519", "2024-01-15", "2024-02-29")
+    api.get_prices("600519", "2023-12-01", "2024-02-15")
+    api.get_prices("600519", "2024-01-10", "2024-02-20")
+
+    assert _price_requests(provider) == [("2024-01-01", "2024-01-31"), ("2024-02-01", "2024-02-29"), ("2023-12-01", "2023-12-31")]
+    assert api.get_prices("600519", "2024-01-01", "2024-01-31") == january
+    prices = api.get_prices("600519", "2023-12-01", "2024-02-29")
+    times = [price.time for price in prices]
+    assert times == sorted(set(times))
+    assert times[0].startswith("2023-12-01") and times[-1].startswith("2024-02-29")
+
+
+def test_a_fresh_cache_is_served_from_the_price_store(api, provider, monkeypatch):
+    stored = api.get_prices("600519", "2024-01-01", "2024-03-31")
+    monkeypatch.setattr(api, "_cache", Cache())
+
+    assert api.get_prices("600519", "2024-02-01", "2024-02-29") == [price for price in stored if "2024-02" in price.time]
+    assert api.get_prices("600519", "2024-01-01", "2024-03-31") == stored
+    assert _price_requests(provider) == [("2024-01-01", "2024-03-31")]
+    # Only the part of a request the store does not cover reaches the provider
+    api.get_prices("600519", "2024-03-01", "2024-04-30")
+    assert _price_requests(provider)[1:] == [("2024-04-01", "2024-04-30")]
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+import requests
+
+from src.tools import rate_limit
+
+
+def _http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"HTTP {status}", response=response)
+
+
+class _Flaky:
+    """Raises the given errors in turn, then returns "ok"."""
+
+    def __init__(self, *errors: Exception):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+@pytest.fixture(autouse=True)
+def no_waiting(monkeypatch):
+    # Fresh token buckets per test, and no sleeping between attempts
+    monkeypatch.setattr(rate_limit, "_buckets", {})
+    monkeypatch.setattr(rate_limit, "backoff_delay", lambda attempt: 0)
+
+
+@pytest.mark.parametrize("error", [
+    _http_error(429),
+    _http_error(503),
+    requests.ConnectionError("reset"),
+    requests.Timeout("slow"),
+    json.JSONDecodeError("Expecting value", "<html>", 0),
+    ConnectionError("reset"),
+    TimeoutError("slow"),
+])
+def test_transient_errors_are_retried(error):
+    fetch = _Flaky(error, error)
+    assert rate_limit.is_retryable(error)
+    assert rate_limit.call_with_retry("test_transient", fetch, max_retries=3) == "ok"
+    assert fetch.calls == 3
+
+
+@pytest.mark.parametrize("error", [_http_error(404), ValueError("bad symbol"), KeyError("日期")])
+def test_other_errors_are_raised_at_once(error):
+    fetch = _Flaky(error)
+    assert not rate_limit.is_retryable(error)
+    with pytest.raises(type(error)):
+        rate_limit.call_with_retry("test_permanent", fetch, max_retries=3)
+    assert fetch.calls == 1
+
+
+def test_last_transient_error_is_raised_once_retries_run_out():
+    last = ConnectionError("still down")
+    fetch = _Flaky(ConnectionError("down"), ConnectionError("down"), last)
+    with pytest.raises(ConnectionError) as raised:
+        rate_limit.call_with_retry("test_exhausted", fetch, max_retries=2)
+    assert raised.value is last
+    assert fetch.calls == 3
@@ -0,0 +1,39 @@
+import pytest
+
+from src.data.requirements import WINDOW, plan_data_requirements
+
+
+def test_base_requirements_cover_prices_over_the_window():
+    plan = plan_data_requirements([], "2024-03-01", "2024-03-01", 30)
+    assert plan == {"prices": {"start_date": "2024-01-31", "end_date": "2024-03-01", "limit": None, "periods": [], "fields": []}}
+
+
+def test_merges_analysts_in_prefetch_order():
+    requirements = [
+        {"company_news": {"start": 7, "limit": 50}, "line_items": {"fields": ["revenue"], "period": "ttm", "limit": 4}},
+        {"line_items": {"fields": ["revenue", "net_income"], "period": "annual", "limit": 10}, "prices": {"start": 365}},
+    ]
+    plan = plan_data_requirements(requirements, "2024-03-01", "2024-03-01", 30)
+    assert list(plan) == ["prices", "line_items", "company_news"]
+    assert plan["prices"]["start_date"] == "2023-03-02"
+    assert plan["line_items"] == {"start_date": None, "end_date": "2024-03-01", "limit": 10, "periods": ["ttm", "annual"], "fields": ["revenue", "net_income"]}
+    assert plan["company_news"]["start_date"] == "2024-02-23"
+    assert plan["company_news"]["limit"] == 50
+
+
+def test_unbounded_start_wins():
+    plan = plan_data_requirements([{"insider_trades": {"start": None, "limit": 100}}, {"insider_trades": {"start": WINDOW, "limit": 10}}], "2024-03-01", "2024-03-01", 30)
+    assert plan["insider_trades"]["start_date"] is None
+    assert plan["insider_trades"]["limit"] == 100
+
+
+def test_ranged_datasets_over_several_dates_drop_the_limit():
+    plan = plan_data_requirements([{"company_news": {"start": WINDOW, "limit": 50}, "financial_metrics": {"period": "ttm", "limit": 10}}], "2024-01-01", "2024-03-01", 30)
+    assert plan["company_news"]["start_date"] == "2023-12-02"
+    assert plan["company_news"]["limit"] is None
+    assert plan["financial_metrics"]["limit"] == 10
+
+
+def test_unknown_dataset():
+    with pytest.raises(ValueError):
+        plan_data_requirements([{"options": {}}], "2024-03-01", "2024-03-01", 30)
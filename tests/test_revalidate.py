@@ -0,0 +1,38 @@
+import datetime
+import time
+
+
+def _wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_stale_entry_is_refreshed_for_a_current_request(api, provider):
+    today = datetime.date.today().isoformat()
+    api.get_company_news("600000", today)
+    api._cache.touch("company_news", "600000", api.CACHE_TTLS["company_news"] + 1)
+
+    assert api.get_company_news("600000", today)
+    assert _wait_for(lambda: provider.count("company_news") == 2)
+    # The refresh restarts the entry's age, so the next read serves the cache without another fetch
+    assert _wait_for(lambda: api._cache.age("company_news", "600000") < 1 and not api._refreshing)
+    api.get_company_news("600000", today)
+    assert provider.count("company_news") == 2
+
+
+def test_stale_entry_is_not_refreshed_for_a_past_request(api, provider):
+    api.get_insider_trades("600000", "2024-01-31", "2024-01-01")
+    api.get_company_news("600000", "2024-06-30")
+    api._cache.touch("insider_trades", "600000", api.CACHE_TTLS["insider_trades"] + 1)
+    api._cache.touch("company_news", "600000", api.CACHE_TTLS["company_news"] + 1)
+
+    assert api.get_insider_trades("600000", "2024-01-31", "2024-01-01")
+    assert api.get_company_news("600000", "2024-06-30")
+    assert not api._refreshing
+    time.sleep(0.05)
+    assert provider.count("insider_trades") == 1
+    assert provider.count("company_news") == 1
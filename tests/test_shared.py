@@ -0,0 +1,74 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.arrays import PRICE_DTYPE
+from src.data.cache import Cache
+from src.data.shared import SharedDataPlane, attach, publish
+
+
+class _NoUpstream:
+    """Provider that fails the test on any call, so a worker can only answer from the shared data plane."""
+
+    def __getattr__(self, dataset: str):
+        def call(*args, **kwargs):
+            raise AssertionError(f"worker called the provider for {dataset}{args}")
+
+        return call
+
+
+def _serve_from_plane(ticker: str, start_date: str, end_date: str) -> tuple[list[dict], list[dict]]:
+    """Runs in a pool worker after attach: read prices and metrics with the upstream provider disabled."""
+    from src.tools import api
+
+    api._provider = _NoUpstream()
+    prices = api.get_prices(ticker, start_date, end_date)
+    metrics = api.get_financial_metrics(ticker, end_date)
+    return [price.model_dump() for price in prices], [metric.model_dump() for metric in metrics]
+
+
+def test_attach_restores_published_prices_coverage_and_valuation(tmp_path):
+    cache = Cache()
+    data = np.zeros(5, dtype=PRICE_DTYPE)
+    data["time"] = np.datetime64("2024-01-01") + np.arange(5)
+    data["close"] = np.arange(5) + 10.0
+    cache.set_prices("AAA", data)
+    cache.add_price_coverage("AAA", "2024-01-01", "2024-01-05")
+    valuation = pd.DataFrame({"数据日期": pd.to_datetime(["2024-01-02", "2024-01-03"]), "总市值": [1e9, 2e9], "PE(TTM)": [10.0, 11.0]})
+    cache.set_valuation("AAA", valuation)
+
+    publish(str(tmp_path), ["AAA"], cache)
+    attached = Cache()
+    loaded = attach(str(tmp_path), attached)
+
+    assert set(loaded) == {("prices", "AAA"), ("valuation", "AAA")}
+    np.testing.assert_array_equal(attached.get_price_array("AAA", "2024-01-01", "2024-01-05"), data)
+    assert attached.missing_price_ranges("AAA", "2024-01-01", "2024-01-05") == []
+    pd.testing.assert_frame_equal(attached.get_price_frame("AAA", "2024-01-01", "2024-01-05"), cache.get_price_frame("AAA", "2024-01-01", "2024-01-05"))
+    pd.testing.assert_frame_equal(attached.get_valuation("AAA"), valuation)
+
+
+def test_pool_workers_serve_published_data_without_the_provider(api, provider, monkeypatch, tmp_path):
+    # Workers are spawned, so they start from a fresh import of api and see only what attach loads
+    monkeypatch.setenv("DATA_PROVIDER", "akshare")
+    monkeypatch.setenv("PRICE_STORE_DIR", str(tmp_path / "worker_prices"))
+    tickers = ["600519", "000001"]
+    expected = {
+        ticker: (
+            [price.model_dump() for price in api.get_prices(ticker, "2024-01-02", "2024-09-30")],
+            [metric.model_dump() for metric in api.get_financial_metrics(ticker, "2024-09-30")],
+        )
+        for ticker in tickers
+    }
+    calls = len(provider.calls)
+
+    with SharedDataPlane(tickers, api._cache) as plane:
+        with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn"), initializer=attach, initargs=(plane.root,)) as pool:
+            served = dict(zip(tickers, pool.map(_serve_from_plane, tickers, ["2024-01-02"] * 2, ["2024-09-30"] * 2)))
+
+    assert all(prices and metrics for prices, metrics in expected.values())
+    assert served == expected
+    assert len(provider.calls) == calls
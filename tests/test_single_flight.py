@@ -0,0 +1,97 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.data.single_flight import AsyncSingleFlight, SingleFlight
+
+
+def test_waiters_share_the_leaders_exception():
+    group = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait()
+        raise RuntimeError("upstream down")
+
+    errors = []
+
+    def call():
+        try:
+            group.do("key", fetch)
+        except RuntimeError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    waiters = [threading.Thread(target=call) for _ in range(3)]
+    for thread in waiters:
+        thread.start()
+    # Let the waiters block on the leader's future before it fails
+    while group.stats()["coalesced"] < len(waiters):
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader, *waiters]:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(errors) == 4
+    assert all(e is errors[0] for e in errors)
+    assert group.stats() == {"in_flight": 0, "coalesced": 3}
+
+
+def test_failed_call_is_not_remembered():
+    group = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        group.do("key", fail)
+    assert group.do("key", lambda: 42) == 42
+
+
+def test_async_callers_share_one_task_and_its_exception():
+    group = AsyncSingleFlight()
+    calls = []
+
+    async def fetch(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        if value == "bad":
+            raise RuntimeError("upstream down")
+        return value
+
+    async def run():
+        good = await asyncio.gather(*(group.do("good", fetch, "good") for _ in range(5)))
+        bad = await asyncio.gather(*(group.do("bad", fetch, "bad") for _ in range(3)), return_exceptions=True)
+        return good, bad
+
+    good, bad = asyncio.run(run())
+    assert calls == ["good", "bad"]
+    assert good == ["good"] * 5
+    assert all(isinstance(e, RuntimeError) and e is bad[0] for e in bad)
+    assert group.stats() == {"in_flight": 0, "coalesced": 6}
+
+
+def test_async_cancelled_waiter_does_not_cancel_the_fetch():
+    group = AsyncSingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return 42
+
+    async def run():
+        waiter = asyncio.ensure_future(group.do("key", fetch))
+        other = asyncio.ensure_future(group.do("key", fetch))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        return await other
+
+    assert asyncio.run(run()) == 42
@@ -0,0 +1,68 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+
+def test_news_is_fetched_once_per_ticker_whatever_the_limit(api, provider):
+    # The analysts read news with different limits and windows
+    results = [api.get_company_news("600000", "2024-06-20", None, limit) for limit in (50, 100, 250, 1000)]
+    results.append(api.get_company_news("600000", "2024-06-20", "2024-06-15", 1000))
+
+    assert provider.count("company_news") == 1
+    assert [len(result) for result in results] == [20, 20, 20, 20, 6]
+    assert results[0][0].date.startswith("2024-06-20")
+    assert [news.title for news in api.get_company_news("600000", "2024-06-10", None, 3)] == ["t9", "t8", "t7"]
+
+
+def test_concurrent_news_callers_share_one_fetch(api, provider):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda limit: api.get_company_news("600000", "2024-12-31", None, limit), [50, 100, 250, 1000] * 4))
+    assert provider.count("company_news") == 1
+    assert {len(result) for result in results} == {30}
+
+
+def test_ticker_without_news_is_not_refetched(api, provider, monkeypatch):
+    monkeypatch.setattr(provider, "company_news", lambda ticker: provider._record("company_news", ticker) or pd.DataFrame())
+    assert api.get_company_news("600000", "2024-12-31") == []
+    assert api.get_company_news("600000", "2024-12-31", limit=50) == []
+    assert provider.count("company_news") == 1
+
+
+def test_insider_trade_limits_share_one_fetch(api, provider):
+    results = [api.get_insider_trades("600000", "2024-01-31", "2024-01-01", limit) for limit in (5, 50, 1000)]
+    assert provider.count("insider_trades") == 1
+    # The limit is not sent upstream, so a small first limit does not truncate later callers
+    assert provider.calls[0][-1] is None
+    assert [len(result) for result in results] == [5, 20, 20]
+    assert results[0][0].filing_date == "2024-01-29"
+
+
+def test_prefetch_fetches_each_valuation_series_once(api, provider):
+    plan = {
+        "financial_metrics": {"periods": ["ttm"], "limit": 10},
+        "market_cap": {},
+        "company_news": {"start_date": None, "limit": 50},
+    }
+    errors = asyncio.run(api.aprefetch(["600000", "000001"], "2024-06-01", "2024-06-30", plan))
+
+    assert errors == {}
+    assert provider.count("valuation") == 2
+    assert provider.count("financial_indicators") == 2
+    assert provider.count("company_news") == 2
+    assert api.get_market_cap("600000", "2024-06-30") is not None
+    assert provider.count("valuation") == 2
+
+
+def test_concurrent_async_callers_share_one_fetch(api, provider):
+    async def run():
+        return await asyncio.gather(
+            *(api.aget_prices("600000", "2024-01-01", "2024-01-31") for _ in range(4)),
+            *(api.aget_insider_trades("600000", "2024-01-31", "2024-01-01", limit) for limit in (5, 50)),
+            *(api.asearch_line_items("600000", ["revenue"], "2024-12-31") for _ in range(3)),
+        )
+
+    results = asyncio.run(run())
+    assert [provider.count(dataset) for dataset in ("prices", "insider_trades", "financial_report")] == [1, 1, 1]
+    assert len(results[0]) == 23
+    assert [len(trades) for trades in results[4:6]] == [5, 20]
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.arrays import PRICE_DTYPE
+from src.data.cache import Cache
+from src.data.snapshot import load_snapshot, save_snapshot
+
+
+def _filled_cache() -> Cache:
+    cache = Cache()
+    data = np.zeros(5, dtype=PRICE_DTYPE)
+    data["time"] = np.datetime64("2024-01-01") + np.arange(5)
+    data["close"] = np.arange(5) + 10.0
+    cache.set_prices("AAA", data)
+    cache.add_price_coverage("AAA", "2024-01-01", "2024-01-05")
+    cache.set_valuation("AAA", pd.DataFrame({"数据日期": pd.to_datetime(["2024-01-02", "2024-01-03"]), "总市值": [1e9, 2e9]}))
+    cache.set_company_news("AAA", [{"ticker": "AAA", "title": "新闻", "date": "2024-06-01T09:30:00", "url": "u1"}])
+    cache.set_insider_trades("AAA", [{"ticker": "AAA", "name": "p1", "filing_date": "2024-01-02", "transaction_shares": 100.0, "shares_owned_after_transaction": 1000.0}])
+    return cache
+
+
+def test_snapshot_round_trip_keeps_entries_and_their_age(tmp_path):
+    cache = _filled_cache()
+    cache.touch("company_news", "AAA", 600)
+    cache.touch("prices", "AAA", 60)
+    save_snapshot(str(tmp_path / "snapshot"), cache)
+
+    restored = Cache()
+    assert load_snapshot(str(tmp_path / "snapshot"), restored, max_age=3600) == 4
+    np.testing.assert_array_equal(restored.get_price_array("AAA", "2024-01-01", "2024-01-05"), cache.get_price_array("AAA", "2024-01-01", "2024-01-05"))
+    assert restored.get_price_coverage("AAA") == cache.get_price_coverage("AAA")
+    pd.testing.assert_frame_equal(restored.get_valuation("AAA"), cache.get_valuation("AAA"))
+    assert restored.get_company_news("AAA") == cache.get_company_news("AAA")
+    assert restored.get_insider_trades("AAA") == cache.get_insider_trades("AAA")
+    # Restored news is as old as it was when saved, so it is still due for its background refresh
+    assert restored.age("company_news", "AAA") == pytest.approx(600, abs=5)
+    assert restored.age("prices", "AAA") == pytest.approx(60, abs=5)
+    assert restored.age("insider_trades", "AAA") < 5
+
+
+def test_entries_older_than_max_age_are_not_restored(tmp_path):
+    cache = _filled_cache()
+    cache.touch("company_news", "AAA", 7200)
+    cache.touch("prices", "AAA", 7200)
+    save_snapshot(str(tmp_path / "snapshot"), cache)
+
+    restored = Cache()
+    assert load_snapshot(str(tmp_path / "snapshot"), restored, max_age=3600) == 2
+    assert not restored.has_prices("AAA")
+    assert restored.get_price_coverage("AAA") == []
+    assert restored.get_company_news("AAA") is None
+    assert restored.get_valuation("AAA") is not None
+    assert restored.get_insider_trades("AAA")
+
+
+def test_missing_snapshot_loads_nothing(tmp_path):
+    assert load_snapshot(str(tmp_path / "absent"), Cache()) == 0